@@ -17,7 +17,7 @@ try:
     from ai_movie_maker.services.marketing import (
         generate_hooks, generate_ctas, generate_variations
     )
-    from ai_movie_maker.services.audio import generate_audio_sync
+    from ai_movie_maker.services.audio import generate_audio_sync, generate_audio_batch
     from ai_movie_maker.services.video_ai import generate_video_clip
     # Load presets
     with open(os.path.join(os.path.dirname(__file__), 'config/presets.json'), 'r', encoding='utf-8') as f:
@@ -34,7 +34,7 @@ except ImportError:
     from ai_movie_maker.services.marketing import (
         generate_hooks, generate_ctas, generate_variations
     )
-    from ai_movie_maker.services.audio import generate_audio_sync
+    from ai_movie_maker.services.audio import generate_audio_sync, generate_audio_batch
     with open('ai_movie_maker/config/presets.json', 'r', encoding='utf-8') as f:
         PRESETS = json.load(f)
 
@@ -60,6 +60,11 @@ if 'detected_models' in st.session_state and st.session_state['detected_models']
         st.session_state['model_name_confirmed'] = selected_model_auto
         st.rerun()
 
+# Render cache hits/misses of this session, counted from the render results: batch renders look the
+# cache up in worker processes, so this process's cache counters never see them
+if 'render_cache_tally' not in st.session_state:
+    st.session_state['render_cache_tally'] = {"hits": 0, "misses": 0}
+
 # We use a key 'model_name_input' so we can update it programmatically
 if 'model_name_input' not in st.session_state:
     st.session_state['model_name_input'] = "gemini-2.5-flash"
@@ -247,10 +252,47 @@ with tab_variations:
             st.error("Need API Key")
         else:
             client = genai.Client(api_key=api_key)
-            variations = generate_variations(client, model_name, st.session_state['current_script'], schema_version="v3.2")
-            for v in variations:
-                with st.expander(f"Variation {v.name}"):
-                    st.json(v.script)
+            st.session_state['variations'] = generate_variations(client, model_name, st.session_state['current_script'], schema_version="v3.2")
+
+    variations = st.session_state.get('variations', [])
+    for v in variations:
+        with st.expander(f"Variation {v.name}"):
+            st.json(v.script)
+
+    if variations and st.button("🎬 Render All Variations"):
+        from ai_movie_maker.services.render_batch import render_variations
+        ar_choice = st.session_state.get('aspect_ratio', '9:16')
+        res = (1080, 1920) if '9:16' in ar_choice else (1920, 1080)
+        bg_music_path = "bg_music_temp.mp3" if os.path.exists("bg_music_temp.mp3") else None
+        base_script = st.session_state.get('current_script')
+        # Changed lines are voiced in the style picked for their scene in the main script
+        voice_styles = {s.scene_id: st.session_state.get(f"v_select_{i}")
+                        for i, s in enumerate(base_script.scenes)} if base_script else None
+        with st.spinner("Rendering shared scenes once, then assembling each variation..."):
+            outcome = render_variations(
+                [(v.name, v.script) for v in variations],
+                base_script=base_script,
+                resolution=res,
+                fontsize=st.session_state.get('sub_font_size', 70),
+                color=st.session_state.get('sub_color', 'white'),
+                bg_music_path=bg_music_path,
+                profile=st.session_state.get('render_profile', 'final'),
+                transition=st.session_state.get('transition', 'dip_to_black'),
+                transition_duration=st.session_state.get('transition_duration', 0.5),
+                synthesize=generate_audio_batch,
+                voice_styles=voice_styles,
+            )
+        tally = st.session_state['render_cache_tally']
+        tally["hits"] += outcome["scenes_cached"]
+        tally["misses"] += outcome["scenes_rendered"] - outcome["scenes_cached"]
+        st.caption(f"Rendered {outcome['scenes_rendered']} unique scenes for {outcome['scenes_total']} scene slots "
+                   f"({outcome['scenes_cached']} from cache).")
+        for name, result in outcome["variants"].items():
+            if result["success"]:
+                st.success(f"Variation {name} ready")
+                st.video(result["output_path"])
+            else:
+                st.error(f"Variation {name} failed: {result['error']}")
 
 with tab_main:
     # Prompt Preview feature
@@ -517,7 +559,8 @@ with tab_main:
                                 output_video = f"scene_{scene.scene_id}.mp4"
                                 with st.spinner("Rendering video..."):
                                     try:
-                                        from ai_movie_maker.services.video import render_scene_video
+                                        from ai_movie_maker.services.video import render_scene_video, get_render_cache
+                                        from ai_movie_maker.services.frame_cache import get_frame_cache
                                     except ImportError:
                                         st.error(f"⚠️ Library Update Required: {e}. Please RESTART the terminal/app to load the correct MoviePy version.")
                                         st.stop()
@@ -531,7 +574,13 @@ with tab_main:
                                     raw_vid_path = f"video_scene_{scene.scene_id}_raw.mp4"
                                     video_input = raw_vid_path if os.path.exists(raw_vid_path) else None
 
-                                    success, res_msg = render_scene_video(img_path, audio_path, scene.dialogue.text, output_video, resolution=res, fontsize=font_s, color=sub_c, video_clip_path=video_input)
+                                    render_stats = {}
+                                    success, res_msg = render_scene_video(img_path, audio_path, scene.dialogue.text, output_video, resolution=res, fontsize=font_s, color=sub_c, video_clip_path=video_input, cache=get_render_cache(),
+                                                                            profile=st.session_state.get('render_profile', 'final'),
+                                                                            overlays=getattr(scene, 'overlays', None),
+                                                                            frame_cache=get_frame_cache(), stats=render_stats)
+                                    if success:
+                                        st.session_state['render_cache_tally']["hits" if render_stats.get("path") == "cached" else "misses"] += 1
                                     if success:
                                         st.video(output_video)
                                     else:
@@ -544,15 +593,107 @@ with tab_main:
              st.session_state['aspect_ratio'] = st.selectbox("Aspect Ratio", ["9:16 (Shorts/Reels)", "16:9 (YouTube/TV)"], index=0)
              st.session_state['sub_font_size'] = st.slider("Subtitle Size", 30, 120, 70)
              st.session_state['sub_color'] = st.color_picker("Subtitle Color", "#FFFFFF")
+             from ai_movie_maker.services.video import RENDER_PROFILES, DEFAULT_RENDER_PROFILE, get_render_cache
+             st.session_state['render_profile'] = st.selectbox(
+                 "Render Profile", list(RENDER_PROFILES.keys()),
+                 index=list(RENDER_PROFILES.keys()).index(DEFAULT_RENDER_PROFILE),
+                 help="draft: half resolution, 12 fps, fast encode - for checking timing. final: full quality."
+             )
+             from ai_movie_maker.services.transitions import TRANSITIONS, DEFAULT_TRANSITION
+             st.session_state['transition'] = st.selectbox(
+                 "Scene Transition", list(TRANSITIONS), index=list(TRANSITIONS).index(DEFAULT_TRANSITION)
+             )
+             st.session_state['transition_duration'] = st.slider("Transition Duration (s)", 0.1, 1.5, 0.5, step=0.1)
+             st.session_state['direct_render'] = st.checkbox(
+                 "Direct render (single pass from sources)", value=False,
+                 help="Builds the movie straight from images/clips/voice in one encode, without scene videos. "
+                      "About half the CPU time of rendering scenes and then assembling them."
+             )
              bg_music_file = st.file_uploader("🎵 Background Music (Optional)", type=["mp3", "wav"])
              
+             cache_stats = get_render_cache().stats()
+             tally = st.session_state['render_cache_tally']
+             st.caption(f"Render cache: {cache_stats['entries']} scenes, {cache_stats['size_bytes'] / 1024 ** 2:.0f} MB, "
+                        f"{tally['hits']} hits / {tally['misses']} misses this session")
+
              bg_music_path = None
              if bg_music_file:
                  bg_music_path = "bg_music_temp.mp3"
                  with open(bg_music_path, "wb") as f:
                      f.write(bg_music_file.getbuffer())
 
-        if st.button("🎞 Render Full Movie", type="primary"):
+        if st.button("🎵 Generate All Audio"):
+             from ai_movie_maker.services.render_batch import build_audio_jobs
+             # The style picked per scene above, else the scene's default voice
+             voice_styles = {s.scene_id: st.session_state.get(f"v_select_{i}") for i, s in enumerate(script.scenes)}
+             with st.spinner(f"Voicing {len(script.scenes)} scenes concurrently..."):
+                 audio_results = generate_audio_batch(build_audio_jobs(script, voice_styles=voice_styles))
+             for r in audio_results:
+                 if r["success"]:
+                     st.caption(f"✅ Scene {r['scene_id']} voiced in {r['elapsed']:.1f}s")
+                 else:
+                     st.error(f"Scene {r['scene_id']} audio failed: {r['error']}")
+             from ai_movie_maker.services.audio import get_tts_cache
+             tts_stats = get_tts_cache().stats()
+             st.caption(f"Voice cache: {tts_stats['entries']} lines, {tts_stats['hit_rate']:.0%} hit rate this session")
+
+        if st.button("🎬 Render All Scenes"):
+             from ai_movie_maker.services.render_batch import render_all_scenes
+             from ai_movie_maker.services.resources import format_usage
+             ar_choice = st.session_state.get('aspect_ratio', '9:16 (Shorts)')
+             res = (1080, 1920) if '9:16' in ar_choice else (1920, 1080)
+             font_s = st.session_state.get('sub_font_size', 70)
+             sub_c = st.session_state.get('sub_color', 'white')
+
+             progress_bar = st.progress(0.0, text="Rendering scenes in parallel...")
+             def _on_scene_done(done, total, result):
+                 status = "✅" if result["success"] else "❌"
+                 progress_bar.progress(done / total, text=f"{status} Scene {result['scene_id']} ({done}/{total})")
+
+             batch_results = render_all_scenes(script, resolution=res, fontsize=font_s, color=sub_c, progress_callback=_on_scene_done,
+                                               profile=st.session_state.get('render_profile', 'final'))
+             tally = st.session_state['render_cache_tally']
+             for r in batch_results:
+                 if r["success"]:
+                     tally["hits" if r["cached"] else "misses"] += 1
+                     source = "from cache" if r["cached"] else f"in {r['elapsed']:.1f}s, {format_usage(r)}"
+                     st.caption(f"✅ Scene {r['scene_id']} rendered {source}")
+                 else:
+                     st.error(f"Scene {r['scene_id']} failed: {r['error']}")
+
+        render_full_movie = st.button("🎞 Render Full Movie", type="primary")
+        if render_full_movie and st.session_state.get('direct_render'):
+             from ai_movie_maker.services.render_batch import build_scene_jobs
+             from ai_movie_maker.services.video import render_movie_direct
+             from ai_movie_maker.services.resources import format_usage
+             ar_choice = st.session_state.get('aspect_ratio', '9:16 (Shorts)')
+             res = (1080, 1920) if '9:16' in ar_choice else (1920, 1080)
+             font_s = st.session_state.get('sub_font_size', 70)
+             sub_c = st.session_state.get('sub_color', 'white')
+
+             jobs = build_scene_jobs(script, resolution=res, fontsize=font_s, color=sub_c)
+             missing = [j["scene_id"] for j in jobs if not os.path.exists(j["audio_path"])]
+             if missing:
+                 st.error(f"Scenes {missing} have no voice audio yet. Please generate audio first.")
+             else:
+                 with st.spinner("Rendering Full Movie in a single pass..."):
+                     final_out = f"final_movie_{script.project_title.replace(' ', '_')}.mp4"
+                     usage = {}
+                     success, msg = render_movie_direct(jobs, final_out, resolution=res, fontsize=font_s, color=sub_c,
+                                                        bg_music_path=bg_music_path,
+                                                        profile=st.session_state.get('render_profile', 'final'),
+                                                        transition=st.session_state.get('transition', 'dip_to_black'),
+                                                        transition_duration=st.session_state.get('transition_duration', 0.5),
+                                                        usage=usage)
+                     st.caption(f"Movie render: {format_usage(usage)}")
+                     if success:
+                         st.success("Movie Rendered Successfully!")
+                         st.video(final_out)
+                         with open(final_out, "rb") as f:
+                             st.download_button("Download Movie", f, file_name=final_out)
+                     else:
+                         st.error(f"Render failed: {msg}")
+        elif render_full_movie:
              # Check if all scenes have videos
              videos = []
              all_ready = True
@@ -568,6 +709,7 @@ with tab_main:
                  with st.spinner("Assembling Full Movie (This may take a minute)..."):
                      try:
                          from ai_movie_maker.services.video import assemble_full_movie
+                         from ai_movie_maker.services.resources import format_usage
                      except ImportError:
                          st.error(f"⚠️ Library Update Required: {e}. Please RESTART the terminal/app to load the correct MoviePy version.")
                          st.stop()
@@ -577,7 +719,13 @@ with tab_main:
                      # Note: Streamlit re-runs script on interaction, so we need to ensure file is saved/accessible.
                      # If uploader is in expander, it might clear on re-run if not careful, but for now we assume persistent within session same run.
                      
-                     success, msg = assemble_full_movie(videos, final_out, bg_music_path=bg_music_path)
+                     usage = {}
+                     success, msg = assemble_full_movie(videos, final_out, bg_music_path=bg_music_path,
+                                                        profile=st.session_state.get('render_profile', 'final'),
+                                                        transition=st.session_state.get('transition', 'dip_to_black'),
+                                                        transition_duration=st.session_state.get('transition_duration', 0.5),
+                                                        usage=usage)
+                     st.caption(f"Movie render: {format_usage(usage)}")
                      if success:
                          st.success("Movie Rendered Successfully!")
                          st.video(final_out)
@@ -585,6 +733,35 @@ with tab_main:
                              st.download_button("Download Movie", f, file_name=final_out)
                      else:
                          st.error(f"Assembly failed: {msg}")
+
+        from ai_movie_maker.services.multi_export import ASPECT_RESOLUTIONS
+        export_aspects = st.multiselect("Export Aspect Ratios", list(ASPECT_RESOLUTIONS.keys()), default=list(ASPECT_RESOLUTIONS.keys()),
+                                        help="One file per aspect ratio, rendered in a single pass over the scene media.")
+        if st.button("📐 Export All Aspect Ratios") and export_aspects:
+             from ai_movie_maker.services.render_batch import build_scene_jobs
+             from ai_movie_maker.services.multi_export import export_multi_aspect
+             font_s = st.session_state.get('sub_font_size', 70)
+             sub_c = st.session_state.get('sub_color', 'white')
+
+             jobs = build_scene_jobs(script, fontsize=font_s, color=sub_c)
+             missing = [j["scene_id"] for j in jobs if not os.path.exists(j["audio_path"])]
+             if missing:
+                 st.error(f"Scenes {missing} have no voice audio yet. Please generate audio first.")
+             else:
+                 base_name = f"final_movie_{script.project_title.replace(' ', '_')}"
+                 outputs = {a: f"{base_name}_{a.replace(':', 'x')}.mp4" for a in export_aspects}
+                 with st.spinner(f"Exporting {len(outputs)} aspect ratios in one pass..."):
+                     success, msg = export_multi_aspect(jobs, outputs, fontsize=font_s, color=sub_c, bg_music_path=bg_music_path,
+                                                        profile=st.session_state.get('render_profile', 'final'),
+                                                        transition=st.session_state.get('transition', 'dip_to_black'),
+                                                        transition_duration=st.session_state.get('transition_duration', 0.5))
+                 if success:
+                     st.success("Export finished!")
+                     for aspect, path in msg.items():
+                         with open(path, "rb") as f:
+                             st.download_button(f"Download {aspect}", f, file_name=path, key=f"dl_{aspect}")
+                 else:
+                     st.error(f"Export failed: {msg}")
              
         with st.expander("View Raw JSON"):
             st.json(script.model_dump())
@@ -1,6 +1,12 @@
-import edge_tts
 import asyncio
+import json
 import os
+import time
+import unicodedata
+
+from ai_movie_maker.services.disk_cache import DiskCache, make_cache_key
+from ai_movie_maker.services.speech_timing import write_speech_timing
+from ai_movie_maker.services.tts_backends import get_tts_backend
 
 # Voice Mapping with Pitch/Rate adjustments to simulate characters
 # Edge TTS typically only has 2 VN voices: NamMinh (Male) and HoaiMy (Female).
@@ -14,36 +20,144 @@ VOICE_MAP = {
     "Female - Fast": {"voice": "vi-VN-HoaiMyNeural", "pitch": "+0Hz", "rate": "+10%"},
 }
 
-async def generate_audio_async(text, voice_style, output_file):
+# Syntheses in flight at once when voicing a whole script (the TTS service throttles bursts)
+TTS_CONCURRENCY = 4
+
+# Synthesized lines keyed by normalized text + resolved voice/pitch/rate, so a line that was
+# voiced before (re-generate, re-render, variations sharing dialogue) is copied, not re-requested.
+# Each line is one entry: its timing record (see services/speech_timing.py) as a JSON line, then the mp3.
+TTS_CACHE_DIR = os.environ.get("AI_MOVIE_MAKER_TTS_CACHE", ".tts_cache")
+TTS_CACHE_MAX_BYTES = 512 * 1024 ** 2
+TTS_CACHE_VERSION = 3
+
+_tts_cache = None
+
+def get_tts_cache():
+    """
+    Returns the process-wide synthesized speech cache (created on first use).
+    """
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = DiskCache(TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES)
+    return _tts_cache
+
+def default_voice_style(voice_gender):
+    """
+    VOICE_MAP entry used for a script's voice_gender ("Male"/"Female") when no style was picked.
+    """
+    return "Male - Default" if "Male" in (voice_gender or "Male") else "Female - Default"
+
+def resolve_voice(voice_style):
+    """
+    Returns the VOICE_MAP settings (voice, pitch, rate) for a style key or just "Male"/"Female".
+    """
+    # Fallback logic ("female" contains "male", so it is checked first)
+    if voice_style not in VOICE_MAP:
+        if "female" in voice_style.lower():
+            return VOICE_MAP["Female - Default"]
+        return VOICE_MAP["Male - Default"]
+    return VOICE_MAP[voice_style]
+
+def normalize_text(text):
+    """
+    Dialogue as sent to the TTS service: NFC-normalized (Vietnamese diacritics have several
+    encodings) with runs of whitespace collapsed, so equivalent lines share a cache entry.
+    """
+    return unicodedata.normalize("NFC", " ".join((text or "").split()))
+
+def tts_cache_key(text, settings, backend):
+    return make_cache_key(version=TTS_CACHE_VERSION, backend=backend.name, text=normalize_text(text),
+                          voice=settings["voice"], pitch=settings["pitch"], rate=settings["rate"])
+
+def _pack_speech(audio, timing):
+    # json.dumps escapes newlines inside strings, so the first b"\n" ends the timing record
+    return json.dumps(timing, ensure_ascii=False).encode("utf-8") + b"\n" + audio
+
+def _cached_speech(cache, text, settings, backend):
+    # (mp3 bytes, timing) of a cached line, or None on a miss: one lookup per line
+    path = cache.get(tts_cache_key(text, settings, backend))
+    if path is None:
+        return None
+    with open(path, "rb") as f:
+        header, _, audio = f.read().partition(b"\n")
+    return audio, json.loads(header)
+
+async def generate_audio_async(text, voice_style, output_file, cache=None, use_cache=True, backend=None):
     """
     Generates audio file from text using edge-tts with specific style.
     voice_style can be a key in VOICE_MAP or just "Male"/"Female".
+    The audio is streamed into memory and saved with a timing sidecar (speech_timing.sidecar_path):
+    exact duration and per-word start/end times, so the renderer needs no duration probe.
+    cache: DiskCache of synthesized lines (default get_tts_cache()); use_cache=False always synthesizes.
+    backend: a tts_backends.TTSBackend or TTS_BACKENDS name ("synthetic" works offline);
+    default DEFAULT_TTS_BACKEND.
     """
-    # Fallback logic
-    if voice_style not in VOICE_MAP:
-        if "male" in voice_style.lower():
-            settings = VOICE_MAP["Male - Default"]
-        elif "female" in voice_style.lower():
-            settings = VOICE_MAP["Female - Default"]
-        else:
-            settings = VOICE_MAP["Male - Default"]
+    settings = resolve_voice(voice_style)
+    text = normalize_text(text)
+    backend = get_tts_backend(backend)
+    cache = (cache or get_tts_cache()) if use_cache else None
+    cached = _cached_speech(cache, text, settings, backend) if cache is not None else None
+    if cached is not None:
+        audio, timing = cached
     else:
-        settings = VOICE_MAP[voice_style]
-        
-    voice = settings["voice"]
-    pitch = settings["pitch"]
-    rate = settings["rate"]
-    
-    communicate = edge_tts.Communicate(text, voice, pitch=pitch, rate=rate)
-    await communicate.save(output_file)
+        audio, timing = await backend.synthesize(text, settings)
+    with open(output_file, "wb") as f:
+        f.write(audio)
+    write_speech_timing(output_file, timing)
+    if cache is not None and cached is None:
+        cache.put_bytes(tts_cache_key(text, settings, backend), _pack_speech(audio, timing))
 
-def generate_audio_sync(text, voice_style, output_file):
+def generate_audio_sync(text, voice_style, output_file, backend=None):
     """
     Synchronous wrapper for generate_audio_async.
     """
     try:
-        asyncio.run(generate_audio_async(text, voice_style, output_file))
+        asyncio.run(generate_audio_async(text, voice_style, output_file, backend=backend))
         return True
     except Exception as e:
         print(f"Error generating audio: {e}")
         return False
+
+async def generate_audio_batch_async(items, concurrency=TTS_CONCURRENCY, backend=None):
+    """
+    Synthesizes many lines concurrently on the running event loop, at most concurrency at a time.
+    items: dicts with scene_id, text, voice_style and output_path (e.g. render_batch.build_audio_jobs).
+    Returns one dict per item, in item order: scene_id, success, output_path, error, elapsed.
+    A failed line is reported in its result and does not cancel the others.
+    backend: as in generate_audio_async, shared by all items.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    backend = get_tts_backend(backend)
+
+    async def _one(item):
+        async with semaphore:
+            start = time.time()
+            try:
+                await generate_audio_async(item["text"], item["voice_style"], item["output_path"], backend=backend)
+                error = None
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            return {
+                "scene_id": item.get("scene_id"),
+                "success": error is None,
+                "output_path": item["output_path"] if error is None else None,
+                "error": error,
+                "elapsed": time.time() - start,
+            }
+
+    return await asyncio.gather(*(_one(item) for item in items))
+
+def generate_audio_batch(items, concurrency=TTS_CONCURRENCY, backend=None):
+    """
+    Synchronous wrapper for generate_audio_batch_async: voices every item on one event loop,
+    so a full script takes about as long as its longest line instead of the sum of all of them.
+    """
+    items = list(items)
+    if not items:
+        return []
+    try:
+        return asyncio.run(generate_audio_batch_async(items, concurrency=concurrency, backend=backend))
+    except Exception as e:
+        print(f"Error generating audio: {e}")
+        return [{"scene_id": item.get("scene_id"), "success": False, "output_path": None, "error": str(e), "elapsed": 0.0}
+                for item in items]
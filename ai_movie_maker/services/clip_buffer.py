@@ -0,0 +1,85 @@
+import numpy as np
+from moviepy.editor import VideoClip
+from PIL import Image
+
+from ai_movie_maker.services.media_io import probe_media, read_video_frames, fit_image
+from ai_movie_maker.services.frame_cache import frame_key, load_frames, store_frames
+
+# Clips up to this many frames are decoded into RAM (SVD clips are 25 frames)
+MAX_BUFFERED_FRAMES = 150
+
+
+class ClipFrameBuffer:
+    """
+    A short clip decoded once and already fitted to the output resolution.
+    Frames for any output time are served from RAM by index arithmetic, looping
+    forwards or ping-pong, so no decoder is re-opened or seeked on loop wraps.
+    """
+
+    def __init__(self, frames, fps):
+        self.frames = frames
+        self.fps = fps
+
+    @property
+    def duration(self):
+        return len(self.frames) / self.fps
+
+    @property
+    def size(self):
+        return (self.frames.shape[2], self.frames.shape[1])
+
+    def frame_index(self, t, pingpong=False):
+        n = len(self.frames)
+        i = int(t * self.fps + 1e-5)
+        if pingpong and n > 1:
+            # 0 1 2 ... n-1 n-2 ... 1 0 1 ...
+            period = 2 * n - 2
+            i %= period
+            return i if i < n else period - i
+        return i % n
+
+    def get_frame(self, t, pingpong=False):
+        return self.frames[self.frame_index(t, pingpong)]
+
+    def to_clip(self, duration, pingpong=False):
+        """
+        MoviePy clip of the given duration that loops the buffered frames.
+        """
+        return VideoClip(lambda t: self.get_frame(t, pingpong), duration=duration)
+
+def load_clip_buffer(path, resolution, max_frames=MAX_BUFFERED_FRAMES, cache=None):
+    """
+    Decodes a short clip once and fits every frame to resolution (cover + center crop).
+    Returns None when the clip is too long to buffer, so callers can stream it instead.
+    cache (a frame cache, see services/frame_cache.py) keeps the fitted frames on disk; later
+    loads of the same clip and resolution memory-map them instead of decoding again.
+    """
+    params = probe_media(path)
+    fps = params["fps"]
+    if not fps or not params["duration"] or params["duration"] * fps > max_frames:
+        return None
+
+    if cache is not None:
+        key = frame_key("clip", path, resolution, max_frames=max_frames)
+        frames = load_frames(cache, key)
+        if frames is not None:
+            return ClipFrameBuffer(frames, fps)
+
+    frames = _decode_fitted(path, resolution, max_frames)
+    if frames is None:
+        return None
+    if cache is not None:
+        store_frames(cache, key, frames)
+    return ClipFrameBuffer(frames, fps)
+
+def _decode_fitted(path, resolution, max_frames):
+    native = read_video_frames(path, max_frames=max_frames)
+    if len(native) == 0:
+        return None
+    if native.shape[2] == resolution[0] and native.shape[1] == resolution[1]:
+        return native
+
+    frames = np.empty((len(native), resolution[1], resolution[0], 3), dtype=np.uint8)
+    for i, frame in enumerate(native):
+        frames[i] = np.asarray(fit_image(Image.fromarray(frame), resolution))
+    return frames
@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+
+from ai_movie_maker.services.disk_cache import DiskCache, file_digest, make_cache_key
+
+# Fitted base-layer frames (image or short AI clip after resize/crop) as .npy files, keyed by
+# source hash + target resolution. They are memory-mapped on load, so a text-only edit re-blends
+# subtitles/overlays over frames paged in on demand instead of decoding and fitting the media again.
+FRAME_CACHE_DIR = os.environ.get("AI_MOVIE_MAKER_FRAME_CACHE", ".frame_cache")
+FRAME_CACHE_MAX_BYTES = 4 * 1024 ** 3
+# Bump when the fitting itself changes
+FRAME_CACHE_VERSION = 1
+
+_frame_cache = None
+
+def get_frame_cache():
+    """
+    Returns the process-wide base frame cache (created on first use).
+    """
+    global _frame_cache
+    if _frame_cache is None:
+        _frame_cache = DiskCache(FRAME_CACHE_DIR, max_bytes=FRAME_CACHE_MAX_BYTES, suffix=".npy")
+    return _frame_cache
+
+def frame_key(kind, source_path, resolution, **params):
+    """
+    Cache key for the fitted frames of one source file at one resolution.
+    """
+    return make_cache_key(version=FRAME_CACHE_VERSION, kind=kind, source=file_digest(source_path),
+                          resolution=list(resolution), **params)
+
+def load_frames(cache, key):
+    """
+    Returns the cached frames for key as a read-only memory map, or None on a miss.
+    """
+    return cache.get_array(key)
+
+def store_frames(cache, key, frames):
+    """
+    Writes a uint8 frame array (one frame or a stack of them) into the cache.
+    """
+    return cache.put_array(key, np.asarray(frames, dtype=np.uint8))
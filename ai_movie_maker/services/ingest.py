@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+
+from PIL import Image
+
+from ai_movie_maker.services.disk_cache import DiskCache, file_digest, make_cache_key
+from ai_movie_maker.services.media_io import run_ffmpeg, probe_media, fit_image
+
+# Normalized (pre-fitted) media, keyed by source hash + target format
+INGEST_CACHE_DIR = os.environ.get("AI_MOVIE_MAKER_INGEST_CACHE", ".ingest_cache")
+INGEST_CACHE_MAX_BYTES = 1024 ** 3
+# Bump when the normalization itself changes
+INGEST_VERSION = 1
+
+_ingest_caches = {}
+
+def get_ingest_cache(kind):
+    """
+    Returns the ingest cache for "image" (png) or "clip" (mp4) assets.
+    """
+    if kind not in _ingest_caches:
+        suffix = ".png" if kind == "image" else ".mp4"
+        _ingest_caches[kind] = DiskCache(os.path.join(INGEST_CACHE_DIR, kind), max_bytes=INGEST_CACHE_MAX_BYTES // 2, suffix=suffix)
+    return _ingest_caches[kind]
+
+def normalize_image(image_path, resolution, cache=None):
+    """
+    Returns a copy of the image already scaled and center-cropped to resolution (RGB png).
+    Converted once per source file and resolution; later calls are cache hits.
+    """
+    cache = cache or get_ingest_cache("image")
+    key = make_cache_key(version=INGEST_VERSION, kind="image", source=file_digest(image_path), resolution=list(resolution))
+    cached = cache.get(key)
+    if cached:
+        return cached
+
+    with Image.open(image_path) as src:
+        img = src.convert("RGBA")
+    # Transparent areas show black, as in the renderer
+    img = Image.alpha_composite(Image.new("RGBA", img.size, (0, 0, 0, 255)), img)
+    img = fit_image(img, resolution).convert("RGB")
+
+    fd, tmp_path = tempfile.mkstemp(suffix=".png")
+    os.close(fd)
+    try:
+        img.save(tmp_path, compress_level=1)
+        return cache.put(key, tmp_path)
+    finally:
+        os.remove(tmp_path)
+
+def normalize_clip(clip_path, resolution, fps=24, cache=None):
+    """
+    Returns a copy of the clip scaled/cropped to resolution in a single ffmpeg pass, without audio.
+    Frame rates above fps are reduced to fps; lower rates (e.g. 6 fps SVD clips) are kept, since
+    the renderer repeats frames by index and duplicating them here would only cost memory.
+    """
+    cache = cache or get_ingest_cache("clip")
+    key = make_cache_key(version=INGEST_VERSION, kind="clip", source=file_digest(clip_path), resolution=list(resolution), fps=fps)
+    cached = cache.get(key)
+    if cached:
+        return cached
+
+    width, height = resolution
+    filters = [f"scale={width}:{height}:force_original_aspect_ratio=increase:flags=lanczos",
+               f"crop={width}:{height}", "setsar=1"]
+    src_fps = probe_media(clip_path)["fps"]
+    if not src_fps or src_fps > fps:
+        filters.append(f"fps={fps}")
+
+    work_dir = tempfile.mkdtemp(prefix="ingest_")
+    try:
+        tmp_path = os.path.join(work_dir, "clip.mp4")
+        run_ffmpeg(["-i", clip_path, "-an", "-vf", ",".join(filters),
+                    "-c:v", "libx264", "-preset", "veryfast", "-crf", "12", "-pix_fmt", "yuv420p", tmp_path])
+        return cache.put(key, tmp_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
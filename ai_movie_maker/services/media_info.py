@@ -0,0 +1,199 @@
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+from ai_movie_maker.services.disk_cache import file_digest
+from ai_movie_maker.services.media_io import probe_media
+
+# Bytes read from the start of a file to find the first MP3 frame (after an ID3v2 tag) or the WAV chunks
+HEADER_SCAN_BYTES = 64 * 1024
+
+# kbit/s by [MPEG-1?][layer][index]; index 0 is "free format", 15 invalid
+_MP3_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Hz by version bits (0: MPEG-2.5, 2: MPEG-2, 3: MPEG-1)
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+# Entries kept by each in-memory lookup below (file hashes, header reads); least recently used go first
+AUDIO_INFO_CACHE_SIZE = 1024
+
+_digests = OrderedDict()
+_infos = OrderedDict()
+_lock = threading.Lock()
+
+
+def _mp3_frame_header(data, offset):
+    """
+    Decodes the 4-byte MPEG audio frame header at offset. Returns a dict or None if it isn't one.
+    """
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset:offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03
+    layer = 4 - ((b1 >> 1) & 0x03)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    channels = 1 if (b3 >> 6) == 3 else 2
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        length = (samples // 8) * bitrate // sample_rate + padding
+    return {"mpeg1": mpeg1, "layer": layer, "bitrate": bitrate, "sample_rate": sample_rate,
+            "channels": channels, "samples": samples, "length": length}
+
+def _id3v2_size(data):
+    # Total size of a leading ID3v2 tag (header + syncsafe body + optional footer), 0 if none
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+    return 10 + size + (10 if data[5] & 0x10 else 0)
+
+def read_mp3_info(path):
+    """
+    Duration, sample rate, channels and bitrate of an MP3 from its frame headers: the frame
+    count of a Xing/Info or VBRI header when present (VBR files), else the audio size over the
+    first frame's bitrate (CBR, e.g. the TTS stream). Returns None if no MPEG audio frame is found.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        data = f.read(HEADER_SCAN_BYTES)
+        base = 0  # file offset of data[0]
+        offset = _id3v2_size(data)
+        if offset + 4 > len(data):
+            # Tag larger than the scan window (e.g. embedded cover art): read past it
+            base = offset
+            f.seek(base)
+            data, offset = f.read(HEADER_SCAN_BYTES), 0
+        # An ID3v1 tag takes the last 128 bytes
+        f.seek(max(0, size - 128))
+        tail = f.read(128)
+    end = size - (128 if tail[:3] == b"TAG" else 0)
+
+    # First frame: a valid header whose successor header sits where its length says (or the window ends)
+    header = None
+    while header is None:
+        offset = data.find(b"\xff", offset)
+        if offset < 0:
+            return None
+        header = _mp3_frame_header(data, offset)
+        if header is not None:
+            following = offset + header["length"]
+            if following + 4 <= len(data) and _mp3_frame_header(data, following) is None:
+                header = None
+        if header is None:
+            offset += 1
+
+    frames = None
+    # Xing/Info sits after the side information; VBRI at a fixed 32 bytes after the header
+    side_info = (32 if header["channels"] == 2 else 17) if header["mpeg1"] else (17 if header["channels"] == 2 else 9)
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info") and len(data) >= xing + 12:
+        if struct.unpack(">I", data[xing + 4:xing + 8])[0] & 0x01:
+            frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+    elif data[offset + 36:offset + 40] == b"VBRI" and len(data) >= offset + 54:
+        frames = struct.unpack(">I", data[offset + 50:offset + 54])[0]
+
+    audio_bytes = end - (base + offset)
+    if frames:
+        duration = frames * header["samples"] / header["sample_rate"]
+        bitrate = int(audio_bytes * 8 / duration)
+    else:
+        duration = audio_bytes * 8 / header["bitrate"]
+        bitrate = header["bitrate"]
+    return {"format": "mp3", "duration": duration, "sample_rate": header["sample_rate"],
+            "channels": header["channels"], "bitrate": bitrate}
+
+def read_wav_info(path):
+    """
+    Duration, sample rate, channels and bitrate of a RIFF/WAVE file from its fmt and data chunks.
+    Returns None if the file isn't a WAV.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, chunk_size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if chunk_id == b"fmt ":
+                body = f.read(chunk_size)
+                _, channels, sample_rate, byte_rate = struct.unpack("<HHII", body[:12])
+                fmt = {"channels": channels, "sample_rate": sample_rate, "byte_rate": byte_rate}
+                f.seek(chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if fmt is None or not fmt["byte_rate"]:
+                    return None
+                # Streamed writers leave the size at 0 / 0xFFFFFFFF: the data runs to the end of the file
+                data_size = min(chunk_size, size - f.tell()) if chunk_size not in (0, 0xFFFFFFFF) else size - f.tell()
+                return {"format": "wav", "duration": data_size / fmt["byte_rate"], "sample_rate": fmt["sample_rate"],
+                        "channels": fmt["channels"], "bitrate": fmt["byte_rate"] * 8}
+            else:
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+def read_audio_info(path):
+    """
+    Header-only metadata of an MP3 or WAV file (by content, not extension):
+    {"format", "duration", "sample_rate", "channels", "bitrate"}, or None for other formats.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(12)
+    if magic[:4] == b"RIFF" and magic[8:12] == b"WAVE":
+        return read_wav_info(path)
+    return read_mp3_info(path)
+
+def _lookup(entries, key, compute):
+    # LRU lookup in one of the bounded dicts above; compute() runs outside the lock on a miss
+    with _lock:
+        if key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+    value = compute()
+    with _lock:
+        entries[key] = value
+        while len(entries) > AUDIO_INFO_CACHE_SIZE:
+            entries.popitem(last=False)
+    return value
+
+def audio_info(path):
+    """
+    read_audio_info cached per file content hash, so copies of a file (TTS cache hits, variant voices)
+    share one entry. The hash itself is remembered per (path, size, mtime): a repeated lookup of an
+    unchanged file costs one stat(). Both caches keep the AUDIO_INFO_CACHE_SIZE most recent entries.
+    """
+    st = os.stat(path)
+    digest = _lookup(_digests, (os.path.abspath(path), st.st_size, st.st_mtime_ns), lambda: file_digest(path))
+    return _lookup(_infos, digest, lambda: read_audio_info(path))
+
+def media_duration(path):
+    """
+    Duration of an audio file in seconds from its headers, falling back to an ffmpeg probe for
+    formats the header reader doesn't handle (or files it can't make sense of).
+    """
+    try:
+        info = audio_info(path)
+    except (OSError, ValueError, struct.error):
+        info = None
+    if info is not None and info["duration"]:
+        return info["duration"]
+    return probe_media(path)["duration"]
@@ -0,0 +1,105 @@
+import re
+import subprocess
+
+import numpy as np
+from moviepy.config import get_setting
+from PIL import Image
+
+
+def run_ffmpeg(args):
+    """
+    Runs the ffmpeg binary configured for MoviePy and raises with its stderr on failure.
+    """
+    cmd = [get_setting("FFMPEG_BINARY"), "-y", "-hide_banner"] + args
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode('utf-8', 'replace')[-500:]}")
+    return proc.stderr.decode('utf-8', 'replace')
+
+def probe_media(path):
+    """
+    Reads stream parameters of a media file from ffmpeg's stream summary.
+    Returns a dict with duration, video_codec, width, height, fps, pix_fmt,
+    audio_codec, sample_rate and channels (None where a stream is missing).
+    """
+    proc = subprocess.run([get_setting("FFMPEG_BINARY"), "-hide_banner", "-i", path],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    infos = proc.stderr.decode('utf-8', 'replace')
+    params = {"duration": None, "video_codec": None, "width": None, "height": None, "fps": None,
+              "pix_fmt": None, "audio_codec": None, "sample_rate": None, "channels": None}
+
+    m = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", infos)
+    if m:
+        params["duration"] = int(m.group(1)) * 3600 + int(m.group(2)) * 60 + float(m.group(3))
+
+    for line in infos.splitlines():
+        line = line.strip()
+        if not line.startswith("Stream #"):
+            continue
+        if " Video: " in line and params["video_codec"] is None:
+            fields = line.split(" Video: ", 1)[1]
+            params["video_codec"] = fields.split()[0].rstrip(",")
+            m = re.search(r"\b(yuv\w+|rgb\w+|gray\w*)", fields)
+            params["pix_fmt"] = m.group(1) if m else None
+            m = re.search(r", (\d+)x(\d+)", fields)
+            if m:
+                params["width"], params["height"] = int(m.group(1)), int(m.group(2))
+            m = re.search(r", ([\d.]+) (?:fps|tbr)", fields)
+            params["fps"] = float(m.group(1)) if m else None
+        elif " Audio: " in line and params["audio_codec"] is None:
+            fields = line.split(" Audio: ", 1)[1]
+            params["audio_codec"] = fields.split()[0].rstrip(",")
+            m = re.search(r", (\d+) Hz, ([^,]+)", fields)
+            if m:
+                params["sample_rate"], params["channels"] = int(m.group(1)), m.group(2).strip()
+    return params
+
+def keyframe_times(path):
+    """
+    Returns the timestamps of the video keyframes (only keyframes are decoded).
+    """
+    infos = run_ffmpeg(["-skip_frame", "nokey", "-i", path, "-an", "-vf", "showinfo", "-f", "null", "-"])
+    return sorted(float(t) for t in re.findall(r"pts_time:([\d.]+)", infos))
+
+def fit_image(img, resolution):
+    """
+    Scales a PIL image to cover the target resolution and center-crops it.
+    Mirrors the MoviePy resize/crop done on clips so both paths frame the picture identically.
+    """
+    if tuple(img.size) == tuple(resolution):
+        # Already normalized
+        return img
+    img_w, img_h = img.size
+    target_ratio = resolution[0] / resolution[1]
+    img_ratio = img_w / img_h
+
+    if img_ratio > target_ratio:
+        new_w = int(img_w * resolution[1] / img_h)
+        img = img.resize((new_w, resolution[1]), Image.LANCZOS)
+        x1 = new_w / 2 - resolution[0] / 2
+        return img.crop((int(x1), 0, int(x1 + resolution[0]), resolution[1]))
+    else:
+        new_h = int(img_h * resolution[0] / img_w)
+        img = img.resize((resolution[0], new_h), Image.LANCZOS)
+        y1 = new_h / 2 - resolution[1] / 2
+        return img.crop((0, int(y1), resolution[0], int(y1 + resolution[1])))
+
+def read_video_frames(path, max_frames=None):
+    """
+    Decodes a whole video in one ffmpeg pass into an (n, h, w, 3) uint8 array at its native size.
+    The decoder process exits before this returns, so no file handle stays open.
+    """
+    params = probe_media(path)
+    width, height = params["width"], params["height"]
+    if not width or not height:
+        raise ValueError(f"No video stream in {path}")
+    args = [get_setting("FFMPEG_BINARY"), "-hide_banner", "-loglevel", "error", "-i", path, "-an"]
+    if max_frames:
+        args += ["-frames:v", str(max_frames)]
+    args += ["-f", "rawvideo", "-pix_fmt", "rgb24", "-"]
+    proc = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode('utf-8', 'replace')[-500:]}")
+    frame_size = width * height * 3
+    n_frames = len(proc.stdout) // frame_size
+    return np.frombuffer(proc.stdout, dtype=np.uint8, count=n_frames * frame_size).reshape(n_frames, height, width, 3)
@@ -0,0 +1,187 @@
+import os
+import subprocess
+import wave
+
+import numpy as np
+from moviepy.config import get_setting
+
+from ai_movie_maker.services.disk_cache import DiskCache, file_digest, make_cache_key
+
+MIX_SAMPLE_RATE = 44100
+MIX_CHANNELS = 2
+
+# Decoded + resampled background music as float32 .npy, keyed by file hash and PCM format.
+# Memory-mapped on load and looped/trimmed through views, so a track used by many
+# assemblies (variants, aspect-ratio exports) is decoded once.
+MUSIC_CACHE_DIR = os.environ.get("AI_MOVIE_MAKER_MUSIC_CACHE", ".music_cache")
+MUSIC_CACHE_MAX_BYTES = 1024 ** 3
+MUSIC_CACHE_VERSION = 1
+
+# Sidechain ducking of background music under the voice.
+# music_volume: music gain while nobody speaks; ducked_volume: gain under the voice (the old fixed 20%).
+# The voice counts as active while its RMS over window seconds is above threshold_db (dBFS).
+# The music starts ducking attack seconds before speech (the mix is offline, so it can look ahead)
+# and recovers over release seconds after it, which also bridges the pauses between words.
+DUCKING = {
+    "music_volume": 0.5,
+    "ducked_volume": 0.2,
+    "threshold_db": -40.0,
+    "attack": 0.08,
+    "release": 0.6,
+    "window": 0.01,
+}
+# Samples interpolated/applied per step when expanding the gain curve (bounds temporary memory)
+MIX_BLOCK_SAMPLES = 1 << 20
+
+_music_cache = None
+
+def get_music_cache():
+    """
+    Returns the process-wide decoded music cache (created on first use).
+    """
+    global _music_cache
+    if _music_cache is None:
+        _music_cache = DiskCache(MUSIC_CACHE_DIR, max_bytes=MUSIC_CACHE_MAX_BYTES, suffix=".npy")
+    return _music_cache
+
+def decode_pcm(path, duration=None, sample_rate=MIX_SAMPLE_RATE, channels=MIX_CHANNELS):
+    """
+    Decodes an audio file (or a video's audio track) to float32 PCM of shape (samples, channels)
+    with a single ffmpeg call.
+    """
+    cmd = [get_setting("FFMPEG_BINARY"), "-hide_banner", "-loglevel", "error", "-i", path, "-vn"]
+    if duration is not None:
+        cmd += ["-t", f"{duration}"]
+    cmd += ["-f", "f32le", "-ac", str(channels), "-ar", str(sample_rate), "-"]
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode('utf-8', 'replace')[-500:]}")
+    return np.frombuffer(proc.stdout, dtype=np.float32).reshape(-1, channels)
+
+def load_music_pcm(path, cache=None, sample_rate=MIX_SAMPLE_RATE, channels=MIX_CHANNELS):
+    """
+    Returns the whole track decoded to float32 PCM, memory-mapped from the music cache
+    (decoded and stored on the first use of this file and format).
+    """
+    cache = cache or get_music_cache()
+    key = make_cache_key(version=MUSIC_CACHE_VERSION, source=file_digest(path), sample_rate=sample_rate, channels=channels)
+    pcm = cache.get_array(key)
+    if pcm is None:
+        cache.put_array(key, decode_pcm(path, sample_rate=sample_rate, channels=channels))
+        pcm = cache.get_array(key)
+    return pcm
+
+def looped_views(pcm, start, stop):
+    """
+    Covers timeline samples [start, stop) of pcm looped end to end with views into pcm.
+    Yields (timeline position, view); nothing is copied, and stop trims the last loop.
+    """
+    if len(pcm) == 0:
+        return
+    position = start
+    while position < stop:
+        offset = position % len(pcm)
+        piece = pcm[offset:offset + (stop - position)]
+        yield position, piece
+        position += len(piece)
+
+def write_wav(path, pcm, sample_rate=MIX_SAMPLE_RATE):
+    """
+    Writes float PCM (samples, channels) as a 16-bit WAV, clipping to full scale.
+    """
+    with wave.open(path, "wb") as w:
+        w.setnchannels(pcm.shape[1])
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        for start in range(0, len(pcm), MIX_BLOCK_SAMPLES):
+            block = np.clip(pcm[start:start + MIX_BLOCK_SAMPLES], -1.0, 1.0) * 32767
+            w.writeframes(block.astype("<i2").tobytes())
+
+def ducking_curve(voice, sample_rate=MIX_SAMPLE_RATE, ducking=None):
+    """
+    Music gain control points from the voice track: returns (sample positions, gains), one point
+    per analysis window. Built from whole-array NumPy ops, with no per-sample Python loop:
+    the latest active window at or before each point and the next one after it come from running
+    max/min accumulations, and release/attack are linear ramps over those distances.
+    """
+    params = dict(DUCKING, **(ducking or {}))
+    hop = max(1, int(round(sample_rate * params["window"])))
+    n = len(voice)
+    windows = -(-n // hop)
+    if windows == 0:
+        return np.zeros(1), np.full(1, params["music_volume"])
+
+    # Mean square per window over all channels; einsum sums without materializing the squares
+    power = np.empty(windows, dtype=np.float64)
+    full = n // hop
+    if full:
+        body = voice[:full * hop].reshape(full, -1)
+        power[:full] = np.einsum("ij,ij->i", body, body, dtype=np.float64) / body.shape[1]
+    if full < windows:
+        tail = voice[full * hop:].ravel()
+        power[full] = np.dot(tail, tail) / len(tail)
+    active = 10 * np.log10(np.maximum(power, 1e-12)) > params["threshold_db"]
+
+    index = np.arange(windows)
+    never = 2 * windows
+    last_on = np.maximum.accumulate(np.where(active, index, -never))
+    next_on = np.minimum.accumulate(np.where(active, index, never)[::-1])[::-1]
+    since = (index - last_on) * params["window"]
+    until = (next_on - index) * params["window"]
+    released = np.clip(1 - since / params["release"], 0, 1) if params["release"] > 0 else (since == 0).astype(float)
+    attacked = np.clip(1 - until / params["attack"], 0, 1) if params["attack"] > 0 else (until == 0).astype(float)
+    amount = np.maximum(released, attacked)
+
+    gains = params["music_volume"] - amount * (params["music_volume"] - params["ducked_volume"])
+    positions = (index + 0.5) * hop
+    return positions, gains
+
+def place_voices(voice_paths, starts=None, crossfade=0.0, duration=None, sample_rate=MIX_SAMPLE_RATE):
+    """
+    Decodes each voice track once and lays them out on one timeline, at starts (seconds) or back
+    to back overlapping by crossfade. Inner joins fade linearly over crossfade seconds, as the
+    transitions do. Returns float32 PCM (samples, channels).
+    """
+    tracks = [decode_pcm(p, sample_rate=sample_rate) for p in voice_paths]
+    overlap = int(round(crossfade * sample_rate))
+    offsets = []
+    position = 0
+    for i, track in enumerate(tracks):
+        offsets.append(int(round(starts[i] * sample_rate)) if starts is not None else position)
+        position = offsets[-1] + len(track) - overlap
+    end = max([o + len(t) for o, t in zip(offsets, tracks)] or [0])
+    total = int(round(duration * sample_rate)) if duration is not None else end
+
+    mix = np.zeros((total, MIX_CHANNELS), dtype=np.float32)
+    for i, (offset, track) in enumerate(zip(offsets, tracks)):
+        track = track[:max(0, total - offset)]
+        if overlap and len(track):
+            track = track.copy()
+            ramp = np.linspace(0, 1, min(overlap, len(track)), endpoint=False, dtype=np.float32)[:, None]
+            if i > 0:
+                track[:len(ramp)] *= ramp
+            if i < len(tracks) - 1:
+                track[len(track) - len(ramp):] *= ramp[::-1]
+        mix[offset:offset + len(track)] += track
+    return mix
+
+def mixdown(voice_paths, output_path, starts=None, crossfade=0.0, duration=None, bg_music_path=None, ducking=None,
+            music_cache=None):
+    """
+    Mixes the voice tracks and (optionally) background music into one WAV for muxing.
+    Voices are placed as in place_voices; the music comes from the decoded music cache, is looped
+    or trimmed to the timeline and ducked under the voice by a sidechain envelope
+    (see DUCKING / ducking_curve). Returns output_path.
+    """
+    mix = place_voices(voice_paths, starts=starts, crossfade=crossfade, duration=duration)
+    if bg_music_path and len(mix):
+        music = load_music_pcm(bg_music_path, cache=music_cache)
+        positions, gains = ducking_curve(mix, ducking=ducking)
+        for start in range(0, len(mix), MIX_BLOCK_SAMPLES):
+            stop = min(start + MIX_BLOCK_SAMPLES, len(mix))
+            gain = np.interp(np.arange(start, stop), positions, gains).astype(np.float32)[:, None]
+            for position, piece in looped_views(music, start, stop):
+                offset = position - start
+                mix[position:position + len(piece)] += piece * gain[offset:offset + len(piece)]
+    write_wav(output_path, mix)
+    return output_path
@@ -0,0 +1,259 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+from moviepy.config import get_setting
+from PIL import Image
+
+from ai_movie_maker.services.clip_buffer import ClipFrameBuffer, MAX_BUFFERED_FRAMES
+from ai_movie_maker.services.media_io import probe_media, read_video_frames, fit_image
+from ai_movie_maker.services.overlays import OverlayTrack
+from ai_movie_maker.services.pipe_renderer import FramePipeWriter, SpriteLayer, frame_count
+from ai_movie_maker.services.resources import ResourceMonitor
+from ai_movie_maker.services.speech_timing import voice_duration
+from ai_movie_maker.services.streaming import ScenePool, MAX_OPEN_SCENES
+from ai_movie_maker.services.subtitles import render_subtitle_sprite
+from ai_movie_maker.services.transitions import TransitionTimeline, DEFAULT_TRANSITION
+from ai_movie_maker.services.video import (
+    DEFAULT_RENDER_PROFILE, SCENE_CODEC, SCENE_AUDIO_CODEC, SCENE_KEYFRAME_INTERVAL,
+    get_render_profile, scale_resolution, _x264_args, mix_timeline_voices,
+)
+
+# Export targets by aspect ratio name
+ASPECT_RESOLUTIONS = {
+    "9:16": (1080, 1920),
+    "16:9": (1920, 1080),
+    "1:1": (1080, 1080),
+}
+# Fitted base pictures each target keeps per scene (least recently used are dropped): enough for
+# every frame of a 25-frame SVD clip at 1080x1920, while a 150-frame clip is fitted as it plays
+FITTED_CACHE_BYTES = 192 * 1024 ** 2
+
+
+class _NativeClipStream:
+    """
+    Sequential decoder for clips too long to buffer: frames at the output fps, native size,
+    looping. Each frame is decoded exactly once; the last history frames are kept in a ring,
+    since every target after the first re-reads a transition window the first one read ahead.
+    """
+
+    def __init__(self, path, fps, history=2):
+        params = probe_media(path)
+        self.shape = (params["height"], params["width"], 3)
+        self.ring = np.zeros((max(1, history),) + self.shape, dtype=np.uint8)
+        self.index = -1
+        cmd = [get_setting("FFMPEG_BINARY"), "-hide_banner", "-loglevel", "error", "-stream_loop", "-1",
+               "-i", path, "-an", "-vf", f"fps={fps}", "-f", "rawvideo", "-pix_fmt", "rgb24", "-"]
+        self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def get(self, index):
+        history = len(self.ring)
+        if index <= self.index - history:
+            raise RuntimeError(f"Clip frame {index} is no longer buffered (at frame {self.index}, keeping {history})")
+        while self.index < index:
+            view = memoryview(self.ring[(self.index + 1) % history]).cast("B")
+            filled = 0
+            while filled < len(view):
+                n = self.proc.stdout.readinto(view[filled:])
+                if not n:
+                    raise RuntimeError("Clip decoder stopped early")
+                filled += n
+            self.index += 1
+        return self.ring[index % history]
+
+    def close(self):
+        self.proc.kill()
+        self.proc.stdout.close()
+        self.proc.wait()
+
+
+class _SceneSource:
+    """
+    A scene's media decoded once, shared by every export target. It is loaded when the timeline
+    reaches the scene and released behind it (through a streaming.ScenePool), together with
+    every target's fitted copies, so memory does not grow with the number of scenes.
+    """
+
+    def __init__(self, scene, fps, pool, pingpong=False, history=2):
+        self.scene = scene
+        self.fps = fps
+        # Frames of a streamed clip kept for re-reads: at least one transition window
+        self.history = history
+        self.pool = pool
+        self.pingpong = pingpong
+        self.duration = voice_duration(scene["audio_path"])
+        self.branches = []
+        self.image = None
+        self.buffer = None
+        self.stream = None
+
+    def load(self):
+        clip_path = self.scene.get("video_clip_path")
+        image_path = self.scene.get("image_path")
+        if clip_path and os.path.exists(clip_path):
+            params = probe_media(clip_path)
+            if params["fps"] and params["duration"] and params["duration"] * params["fps"] <= MAX_BUFFERED_FRAMES:
+                self.buffer = ClipFrameBuffer(read_video_frames(clip_path, max_frames=MAX_BUFFERED_FRAMES), params["fps"])
+            else:
+                self.stream = _NativeClipStream(clip_path, self.fps, history=self.history)
+        elif image_path and os.path.exists(image_path):
+            with Image.open(image_path) as src:
+                img = src.convert("RGBA")
+            # Transparent areas show black, as in the scene renderer
+            self.image = Image.alpha_composite(Image.new("RGBA", img.size, (0, 0, 0, 255)), img)
+
+    def release(self):
+        if self.stream is not None:
+            self.stream.close()
+        self.image = self.buffer = self.stream = None
+        for branch in self.branches:
+            branch.fitted.clear()
+
+    def native_frame(self, t):
+        """
+        (key, frame) of the source picture at scene time t; key changes when the picture does.
+        """
+        self.pool.acquire(self)
+        if self.buffer is not None:
+            index = self.buffer.frame_index(t, self.pingpong)
+            return index, self.buffer.frames[index]
+        if self.stream is not None:
+            index = int(t * self.fps + 1e-5)
+            return index, self.stream.get(index)
+        return 0, self.image
+
+
+class _SceneBranch:
+    """
+    One export target's view of a scene: the shared source fitted to the target resolution,
+    with the subtitle and overlays laid out for it, composited into the target's frame buffer
+    (shared by all of its scenes: the timeline copies frames out before asking for the next one).
+    """
+
+    def __init__(self, source, resolution, fontsize, color, frame):
+        self.source = source
+        self.resolution = resolution
+        self.duration = source.duration
+        self.audio = None
+        sprite, position = render_subtitle_sprite(source.scene.get("subtitle_text", ""), size=resolution,
+                                                  fontsize=fontsize, color=color)
+        self.subtitle = SpriteLayer(sprite, position, resolution)
+        self.overlays = OverlayTrack(source.scene.get("overlays"), resolution, fontsize=fontsize, color=color,
+                                     duration=source.duration)
+        self.frame = frame
+        # Fitted base pictures by source key (frames of a buffered clip, or the single image), LRU
+        self.fitted = OrderedDict()
+        self.max_fitted = max(2, FITTED_CACHE_BYTES // frame.nbytes)
+        source.branches.append(self)
+
+    def _base(self, t):
+        key, native = self.source.native_frame(t)
+        if key in self.fitted:
+            self.fitted.move_to_end(key)
+        else:
+            if native is None:
+                fitted = np.zeros_like(self.frame)
+            elif isinstance(native, Image.Image):
+                fitted = np.asarray(fit_image(native, self.resolution).convert("RGB"))
+            else:
+                fitted = np.asarray(fit_image(Image.fromarray(native), self.resolution))
+            if self.source.stream is not None:
+                # Streamed frames are not revisited by this target
+                self.fitted.clear()
+            self.fitted[key] = fitted
+            while len(self.fitted) > self.max_fitted:
+                self.fitted.popitem(last=False)
+        return self.fitted[key]
+
+    def get_frame(self, t):
+        np.copyto(self.frame, self._base(t))
+        self.subtitle.blit(self.frame)
+        if self.overlays:
+            self.overlays.blit(self.frame, t)
+        return self.frame
+
+
+def export_multi_aspect(scenes, output_paths, fontsize=70, color='white', bg_music_path=None,
+                        profile=DEFAULT_RENDER_PROFILE, transition=DEFAULT_TRANSITION, transition_duration=0.5,
+                        pingpong=False, threads=None, max_open_scenes=MAX_OPEN_SCENES, usage=None):
+    """
+    Renders the movie for several aspect ratios in one pass over the sources.
+    scenes: scene dicts as for video.render_movie_direct.
+    output_paths: {aspect ratio name from ASPECT_RESOLUTIONS: output file}.
+    Each image/clip is decoded once and fanned out to per-target fit + subtitle layout branches,
+    each feeding its own ffmpeg encoder; the encoders run side by side. The voice/music mix
+    is rendered once and shared. Scene media is loaded as the timeline reaches it, at most
+    max_open_scenes at a time (see services/streaming.py).
+    usage: optional dict, filled with the export's peak RSS and open file descriptors.
+    Returns (True, output_paths) or (False, error message).
+    """
+    with ResourceMonitor() as monitor:
+        result = _export_multi_aspect(scenes, output_paths, fontsize, color, bg_music_path, profile, transition,
+                                      transition_duration, pingpong, threads, max_open_scenes)
+    if usage is not None:
+        usage.update(monitor.report())
+    return result
+
+def _export_multi_aspect(scenes, output_paths, fontsize, color, bg_music_path, profile, transition,
+                         transition_duration, pingpong, threads, max_open_scenes):
+    unknown = [a for a in output_paths if a not in ASPECT_RESOLUTIONS]
+    if unknown:
+        return False, f"Unknown aspect ratio(s): {', '.join(unknown)}"
+    if not scenes:
+        return False, "No scenes to render"
+
+    settings = get_render_profile(profile)
+    fps = settings["fps"]
+    fontsize = max(1, int(round(fontsize * settings["scale"])))
+    cpu_count = os.cpu_count() or 1
+    threads = threads or max(1, cpu_count // len(output_paths))
+
+    pool = ScenePool(max_open_scenes)
+    writers = []
+    work_dir = tempfile.mkdtemp(prefix="multi_export_")
+    try:
+        # A transition window's frames (plus the one before it) stay available for every target
+        history = frame_count(transition_duration, fps) + 2
+        sources = [_SceneSource(scene, fps, pool, pingpong=pingpong, history=history) for scene in scenes]
+        timelines = {}
+        for aspect in output_paths:
+            resolution = scale_resolution(ASPECT_RESOLUTIONS[aspect], settings["scale"])
+            frame = np.empty((resolution[1], resolution[0], 3), dtype=np.uint8)
+            branches = [_SceneBranch(source, resolution, fontsize, color, frame) for source in sources]
+            timelines[aspect] = TransitionTimeline(branches, transition=transition,
+                                                   transition_duration=transition_duration, fps=fps)
+
+        # Voice + music are identical for every target: mix them once
+        first = next(iter(timelines.values()))
+        audio_path = mix_timeline_voices(first, [scene["audio_path"] for scene in scenes], bg_music_path,
+                                         os.path.join(work_dir, "mix.wav"))
+
+        encoder_args = ["-force_key_frames", f"expr:gte(t,n_forced*{SCENE_KEYFRAME_INTERVAL})",
+                        "-movflags", "+faststart"] + _x264_args(settings)
+        for aspect, timeline in timelines.items():
+            resolution = timeline.clips[0].resolution
+            writer = FramePipeWriter(output_paths[aspect], resolution, fps, audio_path=audio_path,
+                                     duration=timeline.duration, codec=SCENE_CODEC, audio_codec=SCENE_AUDIO_CODEC,
+                                     encoder_args=encoder_args, threads=threads)
+            writers.append(writer)
+
+        for i in range(frame_count(first.duration, fps)):
+            t = i / fps
+            for writer, timeline in zip(writers, timelines.values()):
+                writer.write(timeline.get_frame(t))
+
+        for writer in writers:
+            writer.close()
+        writers = []
+        return True, output_paths
+    except Exception as e:
+        print(f"Error exporting movie: {e}")
+        return False, str(e)
+    finally:
+        for writer in writers:
+            writer.abort()
+        pool.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,104 @@
+import bisect
+
+from moviepy.editor import ImageClip
+
+from ai_movie_maker.services.pipe_renderer import SpriteLayer
+from ai_movie_maker.services.subtitles import render_subtitle_sprite
+
+# Overlay text is drawn a bit smaller than the dialogue subtitle
+OVERLAY_FONT_SCALE = 0.8
+# Distance of "top"/"bottom" overlays from the frame edge, as a fraction of its height
+OVERLAY_MARGIN = 0.08
+
+
+def _overlay_fields(overlay):
+    """
+    Accepts a schema_v32.Overlay or an equivalent dict.
+    """
+    if isinstance(overlay, dict):
+        return overlay["text"], overlay["start_sec"], overlay["end_sec"], overlay.get("position", "bottom")
+    return overlay.text, overlay.start_sec, overlay.end_sec, overlay.position
+
+def overlay_dicts(overlays):
+    """
+    Plain-dict copies of overlays (for render jobs sent to worker processes and cache keys).
+    """
+    keys = ("text", "start_sec", "end_sec", "position")
+    return [dict(zip(keys, _overlay_fields(o))) for o in overlays or []]
+
+def overlay_position(sprite, position, placement, size):
+    """
+    Moves a centered text sprite to the overlay's "top", "center" or "bottom" placement.
+    """
+    x, y = position
+    h = sprite.shape[0]
+    margin = int(size[1] * OVERLAY_MARGIN)
+    if placement == "top":
+        y = margin
+    elif placement == "bottom":
+        y = size[1] - margin - h
+    return x, y
+
+
+class OverlayTrack:
+    """
+    The timed text overlays of one scene. Each overlay is rasterized once; the scene
+    timeline is split at every start/end into windows, each holding the overlays visible
+    in it, so finding what to draw at time t is one bisect and frames without overlays
+    cost nothing.
+    """
+
+    def __init__(self, overlays, size, fontsize=70, color='white', duration=None):
+        self.size = tuple(size)
+        self.items = []
+        overlay_fontsize = max(1, int(round(fontsize * OVERLAY_FONT_SCALE)))
+        for overlay in overlays or []:
+            text, start, end, placement = _overlay_fields(overlay)
+            if duration is not None:
+                end = min(end, duration)
+            if not text or end <= start:
+                continue
+            sprite, position = render_subtitle_sprite(text, size=self.size, fontsize=overlay_fontsize, color=color)
+            position = overlay_position(sprite, position, placement, self.size)
+            self.items.append({"start": start, "end": end, "sprite": sprite, "position": position,
+                               "layer": SpriteLayer(sprite, position, self.size)})
+
+        # Interval index: windows[i] is active between bounds[i] and bounds[i + 1]
+        self.bounds = sorted({item["start"] for item in self.items} | {item["end"] for item in self.items})
+        self.windows = []
+        for start, end in zip(self.bounds, self.bounds[1:]):
+            self.windows.append(tuple(i for i, item in enumerate(self.items)
+                                      if item["start"] <= start and end <= item["end"]))
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def window_index(self, t):
+        """
+        Index of the window containing t, or None outside every overlay.
+        """
+        i = bisect.bisect_right(self.bounds, t) - 1
+        if i < 0 or i >= len(self.windows) or not self.windows[i]:
+            return None
+        return i
+
+    def active(self, t):
+        """
+        Overlays visible at time t (in their original order).
+        """
+        i = self.window_index(t)
+        return [] if i is None else [self.items[j] for j in self.windows[i]]
+
+    def blit(self, frame, t):
+        """
+        Blends the overlays visible at t onto an RGB frame in place.
+        """
+        for item in self.active(t):
+            item["layer"].blit(frame)
+
+    def to_clips(self):
+        """
+        MoviePy layers, each shown only during its own window.
+        """
+        return [ImageClip(item["sprite"]).set_start(item["start"]).set_end(item["end"]).set_position(item["position"])
+                for item in self.items]
@@ -0,0 +1,177 @@
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+from moviepy.config import get_setting
+
+
+class FramePipeWriter:
+    """
+    One ffmpeg encoder process fed raw rgb24 frames over stdin.
+    Frames are written straight from the caller's (h, w, 3) uint8 buffer, so a renderer
+    can fill and send the same preallocated array for every frame.
+    """
+
+    def __init__(self, output_path, size, fps, audio_path=None, duration=None, codec="libx264",
+                 audio_codec="aac", encoder_args=(), threads=None):
+        self.size = tuple(size)
+        width, height = self.size
+        cmd = [get_setting("FFMPEG_BINARY"), "-y", "-hide_banner", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", f"{fps}", "-i", "-"]
+        if audio_path:
+            cmd += ["-i", audio_path, "-map", "0:v", "-map", "1:a",
+                    "-c:a", audio_codec, "-ar", "44100", "-ac", "2"]
+        if duration is not None:
+            cmd += ["-t", f"{duration}"]
+        cmd += ["-c:v", codec, "-pix_fmt", "yuv420p"] + list(encoder_args)
+        if threads:
+            cmd += ["-threads", str(threads)]
+        cmd.append(output_path)
+        # stderr goes to a file so a chatty encoder can never block on a full pipe
+        self._stderr = tempfile.TemporaryFile()
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._stderr)
+
+    def write(self, frame):
+        """
+        Sends one C-contiguous (h, w, 3) uint8 frame without copying it in Python.
+        """
+        try:
+            self.proc.stdin.write(frame.data)
+        except BrokenPipeError:
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Flushes the pipe and waits for the encoder. Raises RuntimeError if ffmpeg failed.
+        """
+        if self.proc.stdin and not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        returncode = self.proc.wait()
+        if self._stderr.closed:
+            return
+        self._stderr.seek(0)
+        errors = self._stderr.read().decode('utf-8', 'replace')
+        self._stderr.close()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {errors[-500:]}")
+
+    def abort(self):
+        """
+        Stops the encoder without waiting for a complete stream (used after an error).
+        """
+        self.proc.kill()
+        self.proc.wait()
+        self._stderr.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Don't mask the original error with the encoder's complaint about a short stream
+            self.abort()
+        return False
+
+
+class SpriteLayer:
+    """
+    An RGBA sprite blended in place onto RGB frames at a fixed position.
+    The premultiplied colour, inverse alpha and a uint16 scratch buffer are computed once,
+    so each blit is three vectorized ops over the sprite's box and allocates nothing.
+    Rounding matches MoviePy's mask blit (floor of the weighted sum).
+    """
+
+    def __init__(self, sprite, position, frame_size):
+        x, y = position
+        width, height = frame_size
+        # Clip to the frame
+        left, top = max(0, -x), max(0, -y)
+        right = min(sprite.shape[1], width - x)
+        bottom = min(sprite.shape[0], height - y)
+        self.empty = right <= left or bottom <= top
+        if self.empty:
+            return
+        sprite = sprite[top:bottom, left:right]
+        self.x, self.y = x + left, y + top
+        self.h, self.w = sprite.shape[:2]
+
+        alpha = sprite[..., 3:4].astype(np.uint16)
+        self.premultiplied = sprite[..., :3].astype(np.uint16) * alpha
+        self.inverse_alpha = 255 - alpha
+        self.scratch = np.empty((self.h, self.w, 3), dtype=np.uint16)
+
+    def blit(self, frame):
+        if self.empty:
+            return
+        region = frame[self.y:self.y + self.h, self.x:self.x + self.w]
+        np.multiply(region, self.inverse_alpha, out=self.scratch)
+        np.add(self.scratch, self.premultiplied, out=self.scratch)
+        np.floor_divide(self.scratch, 255, out=self.scratch)
+        np.copyto(region, self.scratch, casting="unsafe")
+
+
+class StreamedClipReader:
+    """
+    Decodes a clip that is too long to buffer through an ffmpeg pipe, fitted to resolution
+    and resampled to fps, looping forever. Each frame is read into the caller's buffer.
+    """
+
+    def __init__(self, path, resolution, fps, size=None):
+        width, height = resolution
+        filters = [f"fps={fps}"]
+        if size is not None and tuple(size) != tuple(resolution):
+            filters += [f"scale={width}:{height}:force_original_aspect_ratio=increase:flags=lanczos",
+                        f"crop={width}:{height}"]
+        cmd = [get_setting("FFMPEG_BINARY"), "-hide_banner", "-loglevel", "error", "-stream_loop", "-1",
+               "-i", path, "-an", "-vf", ",".join(filters), "-f", "rawvideo", "-pix_fmt", "rgb24", "-"]
+        self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def read_into(self, frame):
+        view = memoryview(frame).cast("B")
+        filled = 0
+        while filled < len(view):
+            n = self.proc.stdout.readinto(view[filled:])
+            if not n:
+                raise RuntimeError("Clip decoder stopped early")
+            filled += n
+
+    def close(self):
+        self.proc.kill()
+        self.proc.stdout.close()
+        self.proc.wait()
+
+
+def frame_count(duration, fps):
+    """
+    Number of frames MoviePy writes for a clip (one per 1/fps step in [0, duration)).
+    """
+    return len(np.arange(0, duration, 1.0 / fps))
+
+def render_frames(writer, duration, fps, fill_base, layers=(), overlays=None):
+    """
+    Drives the frame loop: fill_base(frame, t) writes the base picture into the preallocated
+    frame, each layer is blitted on top in order, then the timed overlays (an OverlayTrack)
+    visible at t, and the buffer is sent to the writer.
+    Returns the seconds spent compositing (everything but writing to the encoder).
+    """
+    width, height = writer.size
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    composite = 0.0
+    for i in range(frame_count(duration, fps)):
+        t = i / fps
+        start = time.perf_counter()
+        fill_base(frame, t)
+        for layer in layers:
+            layer.blit(frame)
+        if overlays:
+            overlays.blit(frame, t)
+        composite += time.perf_counter() - start
+        writer.write(frame)
+    return composite
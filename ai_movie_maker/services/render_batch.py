@@ -0,0 +1,287 @@
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ai_movie_maker.services.audio import default_voice_style, normalize_text, resolve_voice
+from ai_movie_maker.services.disk_cache import make_cache_key
+from ai_movie_maker.services.frame_cache import get_frame_cache
+from ai_movie_maker.services.overlays import overlay_dicts
+from ai_movie_maker.services.resources import ResourceMonitor
+from ai_movie_maker.services.transitions import DEFAULT_TRANSITION
+from ai_movie_maker.services.video import (
+    render_scene_video, get_render_cache, scene_render_key, assemble_full_movie,
+    DEFAULT_RENDER_PROFILE, DEFAULT_RENDER_BACKEND,
+)
+
+
+def scene_media_paths(scene_id):
+    """
+    Returns the working file paths the app uses for a scene's media.
+    """
+    return {
+        "audio": f"audio_scene_{scene_id}.mp3",
+        "image": f"img_scene_{scene_id}.png",
+        "video_clip": f"video_scene_{scene_id}_raw.mp4",
+        "output": f"scene_{scene_id}.mp4",
+    }
+
+def build_scene_jobs(script, resolution=(1080, 1920), fontsize=70, color='white', use_cache=True, profile=DEFAULT_RENDER_PROFILE, backend=DEFAULT_RENDER_BACKEND):
+    """
+    Builds one render job (kwargs for render_scene_video + scene_id/use_cache) per scene of the script.
+    Missing image / AI clip paths are passed as None so the renderer uses its fallbacks.
+    """
+    jobs = []
+    for scene in script.scenes:
+        paths = scene_media_paths(scene.scene_id)
+        jobs.append({
+            "scene_id": scene.scene_id,
+            "image_path": paths["image"] if os.path.exists(paths["image"]) else None,
+            "audio_path": paths["audio"],
+            "subtitle_text": scene.dialogue.text,
+            "output_path": paths["output"],
+            "resolution": resolution,
+            "fontsize": fontsize,
+            "color": color,
+            "video_clip_path": paths["video_clip"] if os.path.exists(paths["video_clip"]) else None,
+            "profile": profile,
+            "backend": backend,
+            "overlays": overlay_dicts(getattr(scene, "overlays", None)),
+            "use_cache": use_cache,
+        })
+    return jobs
+
+def _render_job(job):
+    """
+    Worker entry point: renders one scene job and reports the outcome as a dict.
+    """
+    start = time.time()
+    kwargs = dict(job)
+    scene_id = kwargs.pop("scene_id")
+    # The cache object holds a lock, so each worker opens the shared cache directory itself
+    use_cache = kwargs.pop("use_cache", False)
+    cache = get_render_cache() if use_cache else None
+    hits_before = cache.hits if cache is not None else 0
+    stats = {}
+    with ResourceMonitor() as monitor:
+        success, msg = render_scene_video(cache=cache, frame_cache=get_frame_cache() if use_cache else None,
+                                          stats=stats, **kwargs)
+    result = {
+        "scene_id": scene_id,
+        "success": success,
+        "cached": cache is not None and cache.hits > hits_before,
+        "output_path": msg if success else None,
+        "error": None if success else msg,
+        "elapsed": time.time() - start,
+        # Per-stage seconds, frame rates and output size/bitrate (see services/render_stats.py)
+        "stats": stats,
+    }
+    # peak_rss_mb / peak_open_fds / leaked_fds of the worker while it rendered this scene
+    result.update(monitor.report())
+    return result
+
+def build_audio_jobs(script, voice_styles=None, only_missing=False):
+    """
+    Builds one voice synthesis item (for audio.generate_audio_batch) per scene of the script.
+    voice_styles: optional {scene_id: VOICE_MAP key}; other scenes use their voice_gender's default style.
+    only_missing: skip scenes whose voice file already exists.
+    """
+    voice_styles = voice_styles or {}
+    items = []
+    for scene in _field(script, "scenes", []):
+        scene_id = _field(scene, "scene_id")
+        dialogue = _field(scene, "dialogue")
+        audio_path = scene_media_paths(scene_id)["audio"]
+        if only_missing and os.path.exists(audio_path):
+            continue
+        items.append({
+            "scene_id": scene_id,
+            "text": _field(dialogue, "text", ""),
+            "voice_style": voice_styles.get(scene_id) or default_voice_style(_field(dialogue, "voice_gender", "Male")),
+            "output_path": audio_path,
+        })
+    return items
+
+def render_scenes_parallel(jobs, max_workers=None, progress_callback=None):
+    """
+    Renders scene jobs in a bounded process pool.
+    progress_callback(done, total, result) is called from the calling thread as each scene finishes.
+    Returns one result dict per job, in job order.
+    """
+    results = {}
+    total = len(jobs)
+    done = 0
+
+    def _report(result):
+        nonlocal done
+        done += 1
+        results[result["scene_id"]] = result
+        if progress_callback:
+            progress_callback(done, total, result)
+
+    runnable = []
+    for job in jobs:
+        if not os.path.exists(job["audio_path"]):
+            _report({"scene_id": job["scene_id"], "success": False, "cached": False, "output_path": None,
+                     "error": f"Missing audio: {job['audio_path']}", "elapsed": 0.0})
+        else:
+            runnable.append(job)
+
+    if runnable:
+        cpu_count = os.cpu_count() or 1
+        workers = max_workers or min(len(runnable), cpu_count)
+        # Split encoder threads between workers so parallel x264 encodes don't oversubscribe the CPU
+        threads = max(1, cpu_count // workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_render_job, dict(job, threads=threads)): job for job in runnable}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Worker crashed (e.g. killed or unpicklable error) - report instead of aborting the batch
+                    result = {"scene_id": job["scene_id"], "success": False, "cached": False, "output_path": None,
+                              "error": str(e), "elapsed": 0.0}
+                _report(result)
+
+    return [results[job["scene_id"]] for job in jobs]
+
+def render_all_scenes(script, resolution=(1080, 1920), fontsize=70, color='white', max_workers=None, progress_callback=None, use_cache=True, profile=DEFAULT_RENDER_PROFILE, backend=DEFAULT_RENDER_BACKEND):
+    """
+    Renders every scene of the script at once in a bounded process pool.
+    Total time is roughly that of the slowest scene instead of the sum of all of them.
+    Scenes whose inputs are unchanged are served from the render cache.
+    """
+    jobs = build_scene_jobs(script, resolution=resolution, fontsize=fontsize, color=color, use_cache=use_cache, profile=profile, backend=backend)
+    return render_scenes_parallel(jobs, max_workers=max_workers, progress_callback=progress_callback)
+
+def _field(obj, name, default=None):
+    # Variation scripts arrive as plain dicts, the main script as a pydantic model
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+def _safe_name(name):
+    return re.sub(r"[^\w-]", "_", str(name))
+
+def variant_audio_path(scene_id, variant_name, text, voice_style):
+    """
+    Voice file for a variant scene whose dialogue differs from the main script.
+    The name carries a hash of the text and resolved voice, so a variant whose dialogue is
+    edited (or regenerated) gets a new file instead of reusing the old voice.
+    """
+    settings = resolve_voice(voice_style)
+    digest = make_cache_key(text=normalize_text(text), voice=settings["voice"], pitch=settings["pitch"],
+                            rate=settings["rate"])
+    return f"audio_scene_{scene_id}_{_safe_name(variant_name)}_{digest[:12]}.mp3"
+
+def plan_variations(variants, base_script=None, output_dir="variants", resolution=(1080, 1920), fontsize=70, color='white',
+                    use_cache=True, profile=DEFAULT_RENDER_PROFILE, backend=DEFAULT_RENDER_BACKEND, synthesize=None,
+                    voice_styles=None):
+    """
+    Maps every scene of every variant to a render job keyed by its render inputs (scene_render_key),
+    so scenes identical across variants share one job.
+    variants: (name, script) pairs; scripts may be models or dicts (generate_variations output).
+    Scenes keep the main script's voice file when their dialogue is unchanged; otherwise the
+    variant's own voice (variant_audio_path, named after its text) is created if missing: all of them are passed to synthesize(items) in one
+    call (audio.generate_audio_batch, so they are voiced concurrently).
+    voice_styles: optional {scene_id: VOICE_MAP key} for those voices, as in build_audio_jobs.
+    Returns (jobs, plans): unique jobs by key, and each variant's scene keys in order.
+    """
+    base_text = {}
+    if base_script is not None:
+        for scene in _field(base_script, "scenes", []):
+            base_text[_field(scene, "scene_id")] = _field(_field(scene, "dialogue"), "text")
+
+    # Resolve every scene's voice file first; the render keys hash the voices' contents
+    voice_styles = voice_styles or {}
+    variant_scenes = []
+    pending = {}
+    for name, script in variants:
+        scenes = []
+        for scene in _field(script, "scenes", []):
+            scene_id = _field(scene, "scene_id")
+            dialogue = _field(scene, "dialogue")
+            text = _field(dialogue, "text", "")
+            audio_path = scene_media_paths(scene_id)["audio"]
+            if base_text.get(scene_id) != text:
+                voice_style = voice_styles.get(scene_id) or default_voice_style(_field(dialogue, "voice_gender", "Male"))
+                audio_path = variant_audio_path(scene_id, name, text, voice_style)
+                if not os.path.exists(audio_path):
+                    pending[audio_path] = {
+                        "scene_id": scene_id,
+                        "text": text,
+                        "voice_style": voice_style,
+                        "output_path": audio_path,
+                    }
+            scenes.append((scene, text, audio_path))
+        variant_scenes.append((name, scenes))
+    if pending and synthesize is not None:
+        synthesize(list(pending.values()))
+
+    jobs = {}
+    plans = {}
+    for name, scenes in variant_scenes:
+        keys = []
+        for scene, text, audio_path in scenes:
+            paths = scene_media_paths(_field(scene, "scene_id"))
+            image_path = paths["image"] if os.path.exists(paths["image"]) else None
+            video_clip_path = paths["video_clip"] if os.path.exists(paths["video_clip"]) else None
+            overlays = overlay_dicts(_field(scene, "overlays"))
+            key = scene_render_key(image_path, audio_path, text, resolution, fontsize, color, video_clip_path,
+                                   profile=profile, backend=backend, overlays=overlays)
+            if key not in jobs:
+                jobs[key] = {
+                    "scene_id": key,
+                    "image_path": image_path,
+                    "audio_path": audio_path,
+                    "subtitle_text": text,
+                    "output_path": os.path.join(output_dir, f"scene_{key[:16]}.mp4"),
+                    "resolution": resolution,
+                    "fontsize": fontsize,
+                    "color": color,
+                    "video_clip_path": video_clip_path,
+                    "profile": profile,
+                    "backend": backend,
+                    "overlays": overlays,
+                    "use_cache": use_cache,
+                }
+            keys.append(key)
+        plans[name] = keys
+    return jobs, plans
+
+def render_variations(variants, base_script=None, output_dir="variants", resolution=(1080, 1920), fontsize=70, color='white',
+                      bg_music_path=None, transition=DEFAULT_TRANSITION, transition_duration=0.5, max_workers=None,
+                      progress_callback=None, use_cache=True, profile=DEFAULT_RENDER_PROFILE, backend=DEFAULT_RENDER_BACKEND,
+                      synthesize=None, voice_styles=None):
+    """
+    Renders A/B/C script variations: each distinct scene is rendered once (in parallel), then every
+    variant is assembled from the shared scene files. Cost is one full render plus the changed scenes.
+    Returns {"variants": {name: {"success", "output_path", "error"}}, "scenes_total", "scenes_rendered",
+    "scenes_cached"}: scene slots over all variants, distinct scenes, and those served from the render cache.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs, plans = plan_variations(variants, base_script=base_script, output_dir=output_dir, resolution=resolution,
+                                  fontsize=fontsize, color=color, use_cache=use_cache, profile=profile,
+                                  backend=backend, synthesize=synthesize, voice_styles=voice_styles)
+    results = {r["scene_id"]: r for r in render_scenes_parallel(list(jobs.values()), max_workers=max_workers,
+                                                                progress_callback=progress_callback)}
+
+    outcomes = {}
+    for name, keys in plans.items():
+        errors = [results[k]["error"] for k in keys if not results[k]["success"]]
+        if errors or not keys:
+            outcomes[name] = {"success": False, "output_path": None, "error": errors[0] if errors else "No scenes"}
+            continue
+        output_path = os.path.join(output_dir, f"variant_{_safe_name(name)}.mp4")
+        success, msg = assemble_full_movie([jobs[k]["output_path"] for k in keys], output_path, bg_music_path=bg_music_path,
+                                           transition_duration=transition_duration, profile=profile, transition=transition)
+        outcomes[name] = {"success": success, "output_path": msg if success else None, "error": None if success else msg}
+
+    return {
+        "variants": outcomes,
+        "scenes_total": sum(len(keys) for keys in plans.values()),
+        "scenes_rendered": len(jobs),
+        "scenes_cached": sum(1 for r in results.values() if r["cached"]),
+    }
+
@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# When set, every scene render / assembly appends its stats as one JSON line to this file
+RENDER_STATS_PATH = os.environ.get("AI_MOVIE_MAKER_RENDER_STATS")
+
+_write_lock = threading.Lock()
+
+
+class RenderTimer:
+    """
+    Wall-clock seconds per render stage. Stages are flat and accumulate, so a stage entered
+    several times (e.g. "composite" once per frame) reports its total.
+    Stage names used by the video service: cache_lookup, audio_probe, normalize, media_load,
+    text_raster, composite, encode, mix_audio, transitions, mux, cache_store.
+    """
+
+    def __init__(self, kind, **fields):
+        self.kind = kind
+        self.fields = dict(fields)
+        self.stages = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def report(self, **fields):
+        """
+        The render's stats as a JSON-serializable dict: kind, total and per-stage seconds, the
+        fields given here or at construction (frames, output_bytes, ...) and, when frames are
+        known, the frame rates of compositing + encoding together and of the encoder alone.
+        """
+        report = {
+            "kind": self.kind,
+            "timestamp": round(time.time(), 3),
+            "total_s": round(time.perf_counter() - self._start, 4),
+            "stages_s": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+        }
+        report.update(self.fields)
+        report.update(fields)
+        frames = report.get("frames")
+        busy = self.stages.get("composite", 0.0) + self.stages.get("encode", 0.0)
+        if frames and busy > 0:
+            report["render_fps"] = round(frames / busy, 2)
+        if frames and self.stages.get("encode", 0.0) > 0:
+            report["encode_fps"] = round(frames / self.stages["encode"], 2)
+        return report
+
+def encoder_stats(output_path, duration):
+    """
+    Size and average bitrate of an encoded file.
+    """
+    if not output_path or not os.path.exists(output_path):
+        return {}
+    size = os.path.getsize(output_path)
+    stats = {"output_bytes": size}
+    if duration:
+        stats["bitrate_kbps"] = round(size * 8 / duration / 1000, 1)
+    return stats
+
+def write_stats(report, path=None):
+    """
+    Appends report as one JSON line to path (default RENDER_STATS_PATH); does nothing when neither is set.
+    """
+    path = path or RENDER_STATS_PATH
+    if not path:
+        return
+    line = json.dumps(report, ensure_ascii=False, default=str) + "\n"
+    with _write_lock:
+        # A single append of one line, so parallel render workers don't interleave records
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
@@ -0,0 +1,107 @@
+import os
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Seconds between samples while a render is monitored
+RESOURCE_SAMPLE_INTERVAL = 0.05
+
+
+def current_rss():
+    """
+    Resident memory of this process in bytes, or None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def open_fd_count():
+    """
+    Number of file descriptors this process has open, or None if it can't be counted.
+    """
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
+
+def format_usage(usage):
+    """
+    "peak memory 120 MB, 9 open files" from a ResourceMonitor report; "n/a" for figures this
+    platform can't measure (None).
+    """
+    rss = usage.get("peak_rss_mb")
+    fds = usage.get("peak_open_fds")
+    rss_text = f"{rss:.0f} MB" if rss is not None else "n/a"
+    fds_text = f"{fds} open files" if fds is not None else "n/a open files"
+    return f"peak memory {rss_text}, {fds_text}"
+
+def _max_rss_bytes():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS; None where there is no resource module
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+class ResourceMonitor:
+    """
+    Samples this process's resident memory and open file descriptors on a background thread
+    for the duration of a with-block (one render). report() returns the peaks, plus the
+    descriptors still open afterwards that were not open before (leaked readers/pipes).
+    Where /proc is missing, peak RSS falls back to the process-lifetime ru_maxrss
+    (None on Windows, which has neither).
+    """
+
+    def __init__(self, interval=RESOURCE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_rss = None
+        self.peak_fds = None
+        self.fds_before = None
+        self.fds_after = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = current_rss()
+        fds = open_fd_count()
+        if rss is not None:
+            self.peak_rss = max(self.peak_rss or 0, rss)
+        if fds is not None:
+            self.peak_fds = max(self.peak_fds or 0, fds)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.fds_before = open_fd_count()
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        self.fds_after = open_fd_count()
+        return False
+
+    def report(self):
+        peak_rss = self.peak_rss if self.peak_rss is not None else _max_rss_bytes()
+        leaked = None
+        if self.fds_before is not None and self.fds_after is not None:
+            leaked = max(0, self.fds_after - self.fds_before)
+        return {
+            "peak_rss_mb": round(peak_rss / 1024 ** 2, 1) if peak_rss is not None else None,
+            "peak_open_fds": self.peak_fds,
+            "leaked_fds": leaked,
+        }
@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+
+from ai_movie_maker.services.media_info import media_duration
+
+# edge-tts streams audio-24khz-48kbitrate-mono-mp3: constant bitrate, 144-byte frames of 24 ms,
+# so the byte count gives the exact duration
+TTS_SAMPLE_RATE = 24000
+TTS_BITRATE = 48000
+# WordBoundary offsets and durations are in 100 ns ticks
+TICKS_PER_SECOND = 10_000_000
+SPEECH_TIMING_VERSION = 1
+
+
+def sidecar_path(audio_path):
+    """
+    Timing sidecar written next to a synthesized voice file.
+    """
+    return f"{audio_path}.json"
+
+def word_timing(boundary):
+    """
+    One WordBoundary event from Communicate.stream() as {"text", "start", "end"} in seconds.
+    """
+    start = boundary["offset"] / TICKS_PER_SECOND
+    return {"text": boundary["text"], "start": round(start, 3),
+            "end": round(start + boundary["duration"] / TICKS_PER_SECOND, 3)}
+
+def build_speech_timing(audio_size, words, text=None, voice=None):
+    """
+    Timing record for a synthesized line of audio_size bytes: duration, format and word timings.
+    """
+    return {
+        "version": SPEECH_TIMING_VERSION,
+        "duration": audio_size * 8 / TTS_BITRATE,
+        "sample_rate": TTS_SAMPLE_RATE,
+        "channels": 1,
+        "bytes": audio_size,
+        "text": text,
+        "voice": voice,
+        "words": list(words),
+    }
+
+def write_speech_timing(audio_path, timing):
+    """
+    Atomically writes timing as audio_path's sidecar. Returns the sidecar path.
+    """
+    path = sidecar_path(audio_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(timing, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+def load_speech_timing(audio_path):
+    """
+    Returns the sidecar timing of a voice file, or None if there is none or it belongs to an
+    older version of the file (its recorded size no longer matches).
+    """
+    try:
+        with open(sidecar_path(audio_path), encoding="utf-8") as f:
+            timing = json.load(f)
+        if timing.get("version") != SPEECH_TIMING_VERSION or timing.get("bytes") != os.path.getsize(audio_path):
+            return None
+        return timing
+    except (OSError, ValueError):
+        return None
+
+def voice_duration(audio_path):
+    """
+    Duration of a voice file in seconds: from its timing sidecar when present, else read from the
+    file's MP3/WAV headers (services/media_info.py).
+    """
+    timing = load_speech_timing(audio_path)
+    if timing is not None:
+        return timing["duration"]
+    return media_duration(audio_path)
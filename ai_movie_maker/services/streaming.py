@@ -0,0 +1,82 @@
+import gc
+from collections import OrderedDict
+
+# Scenes whose decoders / frame buffers may be open at once while a movie streams through.
+# Two covers a crossfade window (outgoing + incoming scene); memory stays flat with scene count.
+MAX_OPEN_SCENES = 2
+
+
+class ScenePool:
+    """
+    Keeps at most max_open StreamedScenes loaded. Loading one more releases the least
+    recently used scene first; close() releases the rest. Scenes are read in timeline order,
+    so with max_open=2 each scene is loaded exactly once.
+    MoviePy clips hold reference cycles, so a released scene's frame buffers would otherwise
+    linger until the next garbage collection; the pool collects right after each release.
+    """
+
+    def __init__(self, max_open=MAX_OPEN_SCENES):
+        self.max_open = max(1, max_open)
+        self.peak_open = 0
+        self.loads = 0
+        self._open = OrderedDict()
+
+    def acquire(self, scene):
+        if scene in self._open:
+            self._open.move_to_end(scene)
+            return
+        if len(self._open) >= self.max_open:
+            while len(self._open) >= self.max_open:
+                old, _ = self._open.popitem(last=False)
+                old.release()
+            gc.collect()
+        scene.load()
+        self.loads += 1
+        self._open[scene] = True
+        self.peak_open = max(self.peak_open, len(self._open))
+
+    def close(self):
+        while self._open:
+            scene, _ = self._open.popitem(last=False)
+            scene.release()
+        gc.collect()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class StreamedScene:
+    """
+    A timeline clip (see transitions.TransitionTimeline) that opens its media only while the
+    timeline is inside it. opener() returns (clip, resources): the clip serving frames and the
+    objects to close(), or callables to call, when the pool releases the scene.
+    audio is None: the movie's sound is mixed separately from the source files (services/mixer.py).
+    """
+
+    def __init__(self, pool, duration, opener):
+        self.pool = pool
+        self.duration = duration
+        self.opener = opener
+        self.audio = None
+        self._clip = None
+        self._resources = ()
+
+    def load(self):
+        self._clip, self._resources = self.opener()
+
+    def release(self):
+        self._clip = None
+        resources, self._resources = self._resources, ()
+        for resource in resources:
+            try:
+                resource() if callable(resource) else resource.close()
+            except Exception:
+                pass
+
+    def get_frame(self, t):
+        self.pool.acquire(self)
+        return self._clip.get_frame(t)
@@ -0,0 +1,160 @@
+import bisect
+import math
+
+import numpy as np
+from moviepy.editor import VideoClip, CompositeAudioClip
+from moviepy.audio.fx.all import audio_fadein, audio_fadeout
+
+# "crossfade": scenes overlap by the transition duration and blend into each other.
+# "dip_to_black": each scene fades in from and out to black over half the duration (no overlap).
+# "cut": scenes are joined as they are.
+TRANSITIONS = ("crossfade", "dip_to_black", "cut")
+DEFAULT_TRANSITION = "dip_to_black"
+# Frames blended per vectorized step inside a transition window
+BLEND_CHUNK_FRAMES = 4
+
+
+def transition_window(transition, durations, transition_duration):
+    """
+    Effective transition length: 0 for cuts, otherwise capped at half the shortest scene
+    so neighbouring transitions never overlap each other.
+    """
+    if transition not in TRANSITIONS:
+        raise ValueError(f"Unknown transition: {transition}")
+    if transition == "cut" or not durations:
+        return 0.0
+    return max(0.0, min([transition_duration] + [d / 2 for d in durations]))
+
+
+class TransitionTimeline:
+    """
+    Places scene clips on one timeline and serves its frames. Outside transition windows a
+    frame is the scene's own frame, passed through untouched; inside a window all of the
+    window's frames are blended in one vectorized step (and kept until the next window), so
+    the work grows with the transition length, not the movie length.
+    """
+
+    def __init__(self, clips, transition=DEFAULT_TRANSITION, transition_duration=0.5, fps=24):
+        self.clips = clips
+        self.fps = fps
+        self.transition = transition
+        self.transition_duration = transition_window(transition, [c.duration for c in clips], transition_duration)
+        d = self.transition_duration
+        overlap = d if transition == "crossfade" else 0.0
+
+        self.starts = []
+        t = 0.0
+        for clip in clips:
+            self.starts.append(t)
+            t += clip.duration - overlap
+        self.duration = t + overlap if clips else 0.0
+
+        # (start, end, kind, scene index); windows never overlap
+        self.windows = []
+        if d > 0 and transition == "crossfade":
+            for i in range(1, len(clips)):
+                self.windows.append((self.starts[i], self.starts[i] + d, "crossfade", i))
+        elif d > 0 and transition == "dip_to_black":
+            half = d / 2
+            for i, clip in enumerate(clips):
+                end = self.starts[i] + clip.duration
+                self.windows.append((self.starts[i], self.starts[i] + half, "in", i))
+                self.windows.append((end - half, end, "out", i))
+        self._window_starts = [w[0] for w in self.windows]
+        self._blended = (None, None)
+
+    def _window_at(self, t):
+        i = bisect.bisect_right(self._window_starts, t) - 1
+        if i >= 0 and t < self.windows[i][1]:
+            return i
+        return None
+
+    def _grid(self, start, end):
+        """
+        Output frame times (multiples of 1/fps) inside [start, end).
+        """
+        first = math.ceil(start * self.fps - 1e-6)
+        last = math.ceil(end * self.fps - 1e-6)
+        return np.arange(first, last) / self.fps
+
+    def _weights(self, kind, times, start, end):
+        """
+        Incoming-picture weight per frame in 1/256 steps.
+        """
+        progress = (times - start) / (end - start)
+        if kind == "out":
+            progress = 1.0 - progress
+        return np.round(progress * 256).astype(np.uint16)[:, None, None, None]
+
+    def _gather(self, i, times):
+        """
+        Scene i's frames at the given timeline times, as uint16. Each frame is copied out as it
+        is fetched, so sources may reuse one output buffer.
+        """
+        first = self.clips[i].get_frame(times[0] - self.starts[i])
+        frames = np.empty((len(times),) + first.shape[:2] + (3,), dtype=np.uint16)
+        frames[0] = first[..., :3]
+        for k in range(1, len(times)):
+            frames[k] = self.clips[i].get_frame(times[k] - self.starts[i])[..., :3]
+        return frames
+
+    def _blend_window(self, index):
+        start, end, kind, i = self.windows[index]
+        times = self._grid(start, end)
+        if not len(times):
+            return times, None
+        # Shape from the window's first frame: streamed sources only keep recent frames
+        height, width = self.clips[i].get_frame(times[0] - self.starts[i]).shape[:2]
+        blended = np.empty((len(times), height, width, 3), dtype=np.uint8)
+        # Frames are blended a few at a time in uint16 to bound the memory of full-HD windows
+        for c in range(0, len(times), BLEND_CHUNK_FRAMES):
+            chunk = times[c:c + BLEND_CHUNK_FRAMES]
+            weight = self._weights(kind, chunk, start, end)
+            # Outgoing frames first, so the incoming scene is the most recently read one
+            # (streamed scenes release the least recently used source)
+            outgoing = self._gather(i - 1, chunk) if kind == "crossfade" else None
+            incoming = self._gather(i, chunk)
+            incoming *= weight
+            if outgoing is not None:
+                outgoing *= 256 - weight
+                incoming += outgoing
+            np.right_shift(incoming, 8, out=incoming)
+            blended[c:c + len(chunk)] = incoming
+        return times, blended
+
+    def get_frame(self, t):
+        index = self._window_at(t)
+        if index is not None and self._blended[0] != index:
+            self._blended = (index, self._blend_window(index))
+        if index is None or not len(self._blended[1][0]):
+            i = max(0, bisect.bisect_right(self.starts, t) - 1)
+            return self.clips[i].get_frame(min(t - self.starts[i], self.clips[i].duration))
+
+        times, frames = self._blended[1]
+        k = min(int(np.searchsorted(times, t + 1e-6)) - 1, len(frames) - 1)
+        return frames[max(k, 0)]
+
+    def audio(self):
+        """
+        The scenes' audio placed on the timeline; crossfades fade voices over the overlap.
+        """
+        tracks = []
+        d = self.transition_duration
+        for i, clip in enumerate(self.clips):
+            track = clip.audio
+            if track is None:
+                continue
+            if self.transition == "crossfade" and d > 0:
+                if i > 0:
+                    track = audio_fadein(track, d)
+                if i < len(self.clips) - 1:
+                    track = audio_fadeout(track, d)
+            tracks.append(track.set_start(self.starts[i]))
+        if not tracks:
+            return None
+        return CompositeAudioClip(tracks).set_duration(self.duration)
+
+    def to_clip(self):
+        clip = VideoClip(self.get_frame, duration=self.duration)
+        audio = self.audio()
+        return clip.set_audio(audio) if audio is not None else clip
@@ -0,0 +1,168 @@
+import abc
+import asyncio
+import hashlib
+import os
+import re
+
+import edge_tts
+import numpy as np
+from moviepy.config import get_setting
+
+from ai_movie_maker.services.speech_timing import TTS_BITRATE, TTS_SAMPLE_RATE, build_speech_timing, word_timing
+
+# Backend used when none is given: "edge" (edge-tts, needs network) or "synthetic" (offline, for
+# benchmarks and load tests of the audio -> render -> assemble pipeline)
+DEFAULT_TTS_BACKEND = os.environ.get("AI_MOVIE_MAKER_TTS_BACKEND", "edge")
+
+# Synthetic speech. latency: seconds per request, spread by +/- jitter (a fraction, fixed per line).
+# A word lasts word_base + word_per_char * len(word) seconds at "+0%" rate, words are separated by
+# word_gap and sentences by sentence_gap, with lead seconds of silence at both ends.
+# That is about 3 Vietnamese words per second, like the edge voices.
+SYNTHETIC_TTS = {
+    "latency": 0.4,
+    "jitter": 0.25,
+    "word_base": 0.14,
+    "word_per_char": 0.04,
+    "word_gap": 0.06,
+    "sentence_gap": 0.35,
+    "lead": 0.1,
+}
+
+
+class TTSBackend(abc.ABC):
+    """
+    A speech synthesizer behind audio.generate_audio_async.
+    Subclasses set name, which is part of the TTS cache key so backends never serve each
+    other's audio, and implement synthesize.
+    """
+
+    name = None
+
+    @abc.abstractmethod
+    async def synthesize(self, text, settings):
+        """
+        Coroutine: settings is a resolved VOICE_MAP entry (voice, pitch, rate).
+        Returns (mp3 bytes, timing record from speech_timing.build_speech_timing).
+        """
+
+
+class EdgeTTSBackend(TTSBackend):
+    """
+    Microsoft Edge's online TTS service, streamed into memory with its WordBoundary events.
+    """
+
+    name = "edge"
+
+    async def synthesize(self, text, settings):
+        communicate = edge_tts.Communicate(text, settings["voice"], pitch=settings["pitch"], rate=settings["rate"],
+                                           boundary="WordBoundary")
+        audio = bytearray()
+        words = []
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio += chunk["data"]
+            elif chunk["type"] == "WordBoundary":
+                words.append(word_timing(chunk))
+        return bytes(audio), build_speech_timing(len(audio), words, text=text, voice=settings["voice"])
+
+
+def _percent(value):
+    # "+10%" -> 0.1
+    m = re.match(r"^([+-]?\d+(?:\.\d+)?)%$", value or "")
+    return float(m.group(1)) / 100 if m else 0.0
+
+def _hertz(value):
+    # "-20Hz" -> -20.0
+    m = re.match(r"^([+-]?\d+(?:\.\d+)?)Hz$", value or "")
+    return float(m.group(1)) if m else 0.0
+
+
+class SyntheticTTSBackend(TTSBackend):
+    """
+    Offline, deterministic stand-in for the TTS service: every word becomes a voiced tone burst
+    whose length follows the word and the style's rate, encoded in the service's own format
+    (48 kbit/s, 24 kHz mono MP3) with exact word timings. The same text and settings always give
+    the same bytes; each request waits a latency that is also fixed per line.
+    params override SYNTHETIC_TTS.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, **params):
+        self.params = dict(SYNTHETIC_TTS, **params)
+
+    def _seed(self, text, settings):
+        digest = hashlib.sha256(f"{settings['voice']}|{settings['pitch']}|{settings['rate']}|{text}".encode("utf-8"))
+        return int.from_bytes(digest.digest()[:8], "big")
+
+    def layout(self, text, settings):
+        """
+        Word timings [{"text", "start", "end"}] and the total duration, in seconds.
+        """
+        p = self.params
+        speed = max(0.1, 1 + _percent(settings.get("rate")))
+        words = []
+        position = p["lead"]
+        for word in text.split():
+            length = (p["word_base"] + p["word_per_char"] * len(word)) / speed
+            words.append({"text": word, "start": round(position, 3), "end": round(position + length, 3)})
+            gap = p["sentence_gap"] if word[-1] in ".!?…" else p["word_gap"]
+            position += length + gap / speed
+        return words, (words[-1]["end"] if words else 0.0) + p["lead"]
+
+    def render_pcm(self, words, duration, settings, seed):
+        """
+        int16 mono PCM at TTS_SAMPLE_RATE: one enveloped harmonic tone per word, silence between.
+        """
+        rng = np.random.default_rng(seed)
+        # Each voice gets its own fundamental between 110 and 230 Hz, shifted by the style's pitch
+        voice_hash = int(hashlib.sha256(settings["voice"].encode("utf-8")).hexdigest()[:8], 16)
+        base = 110.0 + voice_hash % 120 + _hertz(settings.get("pitch"))
+        pcm = np.zeros(int(round(duration * TTS_SAMPLE_RATE)), dtype=np.float32)
+        for word in words:
+            start = int(word["start"] * TTS_SAMPLE_RATE)
+            stop = min(len(pcm), int(word["end"] * TTS_SAMPLE_RATE))
+            t = np.arange(stop - start, dtype=np.float32) / TTS_SAMPLE_RATE
+            f0 = base * (1 + 0.08 * rng.standard_normal())
+            tone = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in (1, 2, 3))
+            pcm[start:stop] = 0.3 * np.hanning(stop - start).astype(np.float32) * tone
+        return (np.clip(pcm, -1, 1) * 32767).astype("<i2")
+
+    async def _encode_mp3(self, pcm):
+        # CBR without Xing/ID3 headers: every frame is 144 bytes / 24 ms, as in the service's stream
+        proc = await asyncio.create_subprocess_exec(
+            get_setting("FFMPEG_BINARY"), "-hide_banner", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(TTS_SAMPLE_RATE), "-ac", "1", "-i", "-",
+            "-c:a", "libmp3lame", "-b:a", str(TTS_BITRATE), "-write_xing", "0", "-id3v2_version", "0",
+            "-f", "mp3", "-",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        audio, err = await proc.communicate(pcm.tobytes())
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {err.decode('utf-8', 'replace')[-500:]}")
+        return audio
+
+    async def synthesize(self, text, settings):
+        seed = self._seed(text, settings)
+        jitter = ((seed % 1000) / 999 * 2 - 1) * self.params["jitter"]
+        await asyncio.sleep(max(0.0, self.params["latency"] * (1 + jitter)))
+        words, duration = self.layout(text, settings)
+        audio = await self._encode_mp3(self.render_pcm(words, duration, settings, seed))
+        return audio, build_speech_timing(len(audio), words, text=text, voice=settings["voice"])
+
+
+TTS_BACKENDS = {
+    "edge": EdgeTTSBackend,
+    "synthetic": SyntheticTTSBackend,
+}
+
+def get_tts_backend(backend=None):
+    """
+    Returns a TTSBackend: backend may be an instance (returned as is), a TTS_BACKENDS name,
+    or None for DEFAULT_TTS_BACKEND.
+    """
+    if isinstance(backend, TTSBackend):
+        return backend
+    name = backend or DEFAULT_TTS_BACKEND
+    if name not in TTS_BACKENDS:
+        raise ValueError(f"Unknown TTS backend: {name}")
+    return TTS_BACKENDS[name]()
@@ -1,92 +1,207 @@
 import os
-from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips, CompositeVideoClip, TextClip, ColorClip, VideoFileClip, CompositeAudioClip
-from PIL import Image, ImageDraw, ImageFont
+import shutil
+import tempfile
+import time
+from functools import partial
+from moviepy.editor import ImageClip, AudioFileClip, CompositeVideoClip, ColorClip, VideoFileClip
+from PIL import Image
 import numpy as np
-import textwrap
+
+from ai_movie_maker.services.disk_cache import DiskCache, file_digest, make_cache_key
+from ai_movie_maker.services.media_io import run_ffmpeg, probe_media, keyframe_times, fit_image
+from ai_movie_maker.services.clip_buffer import load_clip_buffer
+from ai_movie_maker.services.frame_cache import frame_key, load_frames, store_frames
+from ai_movie_maker.services.mixer import mixdown
+from ai_movie_maker.services.resources import ResourceMonitor
+from ai_movie_maker.services.speech_timing import voice_duration
+from ai_movie_maker.services.render_stats import RenderTimer, encoder_stats, write_stats
+from ai_movie_maker.services.streaming import ScenePool, StreamedScene, MAX_OPEN_SCENES
+from ai_movie_maker.services.ingest import normalize_image, normalize_clip
+from ai_movie_maker.services.overlays import OverlayTrack, overlay_dicts
+from ai_movie_maker.services.pipe_renderer import FramePipeWriter, SpriteLayer, StreamedClipReader, render_frames, frame_count
+from ai_movie_maker.services.transitions import TransitionTimeline, DEFAULT_TRANSITION, transition_window
+from ai_movie_maker.services.subtitles import render_subtitle_sprite, sprite_to_frame, resolve_font_path
+
+# Scene renders get a keyframe every N seconds so assembly can stream-copy
+# everything between the transition windows instead of re-encoding it.
+SCENE_KEYFRAME_INTERVAL = 0.5
+SCENE_FPS = 24
+SCENE_CODEC = 'libx264'
+SCENE_AUDIO_CODEC = 'aac'
+
+# Named render profiles: output scale, frame rate and x264 settings.
+# "draft" is for quick timing checks after an edit, "final" for delivery.
+RENDER_PROFILES = {
+    "draft": {"scale": 0.5, "fps": 12, "preset": "ultrafast", "crf": 30},
+    "final": {"scale": 1.0, "fps": SCENE_FPS, "preset": "medium", "crf": 20},
+}
+DEFAULT_RENDER_PROFILE = "final"
+
+# Compositing backends for scenes with motion: "moviepy" (CompositeVideoClip.write_videofile)
+# or "pipe" (preallocated frame buffer + in-place blits streamed to one ffmpeg process)
+RENDER_BACKENDS = ("moviepy", "pipe")
+DEFAULT_RENDER_BACKEND = "moviepy"
+
+# Render cache: finished scene mp4s keyed by a hash of every render input.
+# Bump RENDER_CACHE_VERSION whenever a code change alters rendered output.
+RENDER_CACHE_VERSION = 5
+RENDER_CACHE_DIR = os.environ.get("AI_MOVIE_MAKER_RENDER_CACHE", ".render_cache")
+RENDER_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+_render_cache = None
+
+def get_render_cache():
+    """
+    Returns the process-wide scene render cache (created on first use).
+    """
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = DiskCache(RENDER_CACHE_DIR, max_bytes=RENDER_CACHE_MAX_BYTES, suffix=".mp4")
+    return _render_cache
+
+def get_render_profile(profile=DEFAULT_RENDER_PROFILE):
+    """
+    Returns the settings of a render profile; unknown names fall back to the default profile.
+    """
+    return RENDER_PROFILES.get(profile, RENDER_PROFILES[DEFAULT_RENDER_PROFILE])
+
+def scale_resolution(resolution, scale):
+    """
+    Scales a (width, height) resolution, keeping both sides even as yuv420p requires.
+    """
+    return (int(round(resolution[0] * scale / 2)) * 2, int(round(resolution[1] * scale / 2)) * 2)
+
+def _x264_args(settings):
+    return ["-preset", settings["preset"], "-crf", str(settings["crf"])]
+
+def scene_render_key(image_path, audio_path, subtitle_text, resolution, fontsize, color, video_clip_path=None, still_fast_path=True, pingpong=False, normalize_media=True, profile=DEFAULT_RENDER_PROFILE, backend=DEFAULT_RENDER_BACKEND, overlays=None):
+    """
+    Cache key covering everything that affects a scene render: media bytes, subtitle, layout and encoder settings.
+    """
+    return make_cache_key(
+        version=RENDER_CACHE_VERSION,
+        image=file_digest(image_path),
+        audio=file_digest(audio_path),
+        video_clip=file_digest(video_clip_path),
+        subtitle=subtitle_text,
+        resolution=list(resolution),
+        fontsize=fontsize,
+        font=resolve_font_path(),
+        color=color,
+        encoder={"codec": SCENE_CODEC, "audio_codec": SCENE_AUDIO_CODEC,
+                 "keyframe_interval": SCENE_KEYFRAME_INTERVAL, "still_fast_path": still_fast_path},
+        profile=get_render_profile(profile),
+        pingpong=pingpong,
+        normalize_media=normalize_media,
+        backend=backend,
+        overlays=overlay_dicts(overlays),
+    )
 
 def generate_text_image(text, size=(1920, 1080), fontsize=60, color=(255, 255, 255), bgcolor=None):
     """
-    Generates a transparent image with text using Pillow to avoid ImageMagick dependency.
+    Generates a transparent full-frame image with text using Pillow to avoid ImageMagick dependency.
+    Prefer render_subtitle_sprite, which returns only the text's bounding box and its offset.
     """
-    img = Image.new('RGBA', size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Try to load a font, fallback to default
-    try:
-        font = ImageFont.truetype("arial.ttf", fontsize)
-    except IOError:
-        font = ImageFont.load_default()
-    
-    # Wrap text
-    max_char = int(size[0] / (fontsize * 0.6))  # Rough estimate
-    lines = textwrap.wrap(text, width=max_char)
-    
-    # Calculate text height
-    # Use getbbox if available (Pillow >= 9.2.0) or getsize (deprecated)
-    # We'll use a simple approximation for line height
-    line_height = fontsize * 1.5
-    total_height = len(lines) * line_height
-    
-    y_text = (size[1] - total_height) / 2
-    if bgcolor:
-         # Draw background box if needed (optional)
-         pass
-
-    for line in lines:
-        # Check text width
-        try:
-             bbox = font.getbbox(line)
-             w = bbox[2] - bbox[0]
-        except:
-             w = fontsize * len(line) * 0.5 # fallback
-
-        x_text = (size[0] - w) / 2
-        
-        # Shadow/Outline
-        draw.text((x_text+2, y_text+2), line, font=font, fill=(0,0,0))
-        draw.text((x_text, y_text), line, font=font, fill=color)
-        y_text += line_height
-        
-    return np.array(img)
+    sprite, position = render_subtitle_sprite(text, size=size, fontsize=fontsize, color=color)
+    return sprite_to_frame(sprite, position, size)
 
-def render_scene_video(image_path, audio_path, subtitle_text, output_path, resolution=(1080, 1920), fontsize=70, color='white', video_clip_path=None):
+def _fitted_base_image(image_path, resolution, frame_cache=None):
     """
-    Renders a single scene video: Image/Video + Audio + Subtitle.
-    Resolution determines aspect ratio (e.g. 1080x1920 for 9:16, 1920x1080 for 16:9).
+    Loads the scene image fitted to resolution as an opaque RGBA PIL image.
+    A missing image gives a black background, like the clip-based path.
+    frame_cache (see services/frame_cache.py) keeps the fitted pixels so later renders skip decode + fit.
     """
+    if image_path and os.path.exists(image_path):
+        key = None
+        if frame_cache is not None:
+            key = frame_key("image", image_path, resolution)
+            frame = load_frames(frame_cache, key)
+            if frame is not None:
+                return Image.fromarray(frame).convert("RGBA")
+        with Image.open(image_path) as src:
+            base = src.convert("RGBA")
+        # Transparent areas show black, as MoviePy's image mask would
+        base = Image.alpha_composite(Image.new("RGBA", base.size, (0, 0, 0, 255)), base)
+        base = fit_image(base, resolution)
+        if key is not None:
+            store_frames(frame_cache, key, np.asarray(base.convert("RGB")))
+        return base
+    return Image.new("RGBA", resolution, (0, 0, 0, 255))
+
+def compose_still_frame(image_path, subtitle_text, resolution=(1080, 1920), fontsize=70, color='white', frame_cache=None, timer=None):
+    """
+    Merges the (fitted) scene image and its subtitle into a single RGB frame.
+    timer: optional render_stats.RenderTimer, booked with media_load / text_raster / composite.
+    """
+    timer = timer or RenderTimer("still")
+    with timer.stage("media_load"):
+        base = _fitted_base_image(image_path, resolution, frame_cache=frame_cache)
+    with timer.stage("text_raster"):
+        sprite, position = render_subtitle_sprite(subtitle_text, size=resolution, fontsize=fontsize, color=color)
+
+    # Blend only the subtitle's bounding box
+    with timer.stage("composite"):
+        base.alpha_composite(Image.fromarray(sprite), dest=position)
+        return np.array(base.convert("RGB"))
+
+def _encode_still_scene(frame, audio_path, duration, output_path, settings, threads=None):
+    """
+    Encodes one pre-composited frame + the voice track with ffmpeg, tuned for still images.
+    Output stream parameters match the MoviePy scene renders so assembly can stream-copy either.
+    """
+    work_dir = tempfile.mkdtemp(prefix="still_")
     try:
-        # Load Audio
-        audio = AudioFileClip(audio_path)
-        duration = audio.duration
-        
-        # Load Video or Image as Base Clip
-        base_clip = None
-        
-        if video_clip_path and os.path.exists(video_clip_path):
-            # Use generated AI video
-            # Load video
+        frame_path = os.path.join(work_dir, "frame.png")
+        Image.fromarray(frame).save(frame_path, compress_level=1)
+        args = ["-loop", "1", "-framerate", str(settings["fps"]), "-i", frame_path, "-i", audio_path,
+                "-t", f"{duration}", "-map", "0:v", "-map", "1:a",
+                "-c:v", SCENE_CODEC, "-tune", "stillimage", "-pix_fmt", "yuv420p",
+                "-force_key_frames", f"expr:gte(t,n_forced*{SCENE_KEYFRAME_INTERVAL})",
+                "-c:a", SCENE_AUDIO_CODEC, "-ar", "44100", "-ac", "2"] + _x264_args(settings)
+        if threads:
+            args += ["-threads", str(threads)]
+        run_ffmpeg(args + [output_path])
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def _build_composited_clip(audio, duration, image_path, subtitle_text, resolution, fontsize, color, video_clip_path, pingpong=False, overlays=None, frame_cache=None):
+    """
+    General MoviePy path: base clip (AI video / image / black) + subtitle layer + timed overlays
+    (an OverlayTrack, each layer only active in its own window), composited per frame.
+    Returns (clip, raw_video); raw_video is the streamed VideoFileClip to close after writing, or None.
+    """
+    # Load Video or Image as Base Clip
+    base_clip = None
+    raw_video = None
+    
+    if video_clip_path and os.path.exists(video_clip_path):
+        # Use generated AI video
+        # Short clips (e.g. 25-frame SVD) are decoded once, fitted to the resolution and looped from RAM
+        clip_buffer = load_clip_buffer(video_clip_path, resolution, cache=frame_cache)
+        if clip_buffer is not None:
+            base_clip = clip_buffer.to_clip(duration, pingpong=pingpong)
+        else:
+            # Long clip: stream it from the file
             raw_video = VideoFileClip(video_clip_path)
             
             # Loop video if shorter than audio, or cut if longer
             if raw_video.duration < duration:
-                # Loop
-                # Calculate how many times to loop
-                # n_loops = int(duration / raw_video.duration) + 1
                 base_clip = raw_video.loop(duration=duration)
             else:
                 base_clip = raw_video.subclip(0, duration)
                 
             # Mute raw video audio if present
             base_clip = base_clip.without_audio()
-            
-        elif image_path and os.path.exists(image_path):
-            base_clip = ImageClip(image_path).set_duration(duration)
-        else:
-            # Fallback black screen
-            base_clip = ColorClip(size=resolution, color=(0,0,0)).set_duration(duration)
-            
-        # Smart Resize/Crop to fill screen without distortion
-        # Same logic for Image or Video
+        
+    elif image_path and os.path.exists(image_path):
+        base_clip = ImageClip(image_path).set_duration(duration)
+    else:
+        # Fallback black screen
+        base_clip = ColorClip(size=resolution, color=(0,0,0)).set_duration(duration)
+        
+    # Smart Resize/Crop to fill screen without distortion
+    # Same logic for Image or Video (buffered clips are already fitted)
+    if tuple(base_clip.size) != tuple(resolution):
         img_w, img_h = base_clip.size
         # Caluclate target ratios
         target_ratio = resolution[0] / resolution[1]
@@ -107,28 +222,239 @@ def render_scene_video(image_path, audio_path, subtitle_text, output_path, resol
             current_height = base_clip.h
             y_center = current_height / 2
             base_clip = base_clip.crop(y1=y_center - req_height/2, height=req_height)
-            
-        base_clip = base_clip.set_position("center")
-            
-        # Create Subtitle (using Pillow -> numpy array -> ImageClip)
-        txt_img = generate_text_image(subtitle_text, size=resolution, fontsize=fontsize, color=color)
-        txt_clip = ImageClip(txt_img).set_duration(duration).set_position("center")
         
-        # Composite
-        video = CompositeVideoClip([base_clip, txt_clip])
-        video = video.set_audio(audio)
-        video = video.set_duration(duration)
+    base_clip = base_clip.set_position("center")
         
-        # Write file
-        video.write_videofile(output_path, fps=24, codec='libx264', audio_codec='aac', verbose=False, logger=None)
-        
-        # Close clips to release resources
+    # Create Subtitle sprite (Pillow -> cropped RGBA array -> ImageClip); only its box gets blended per frame
+    sprite, position = render_subtitle_sprite(subtitle_text, size=resolution, fontsize=fontsize, color=color)
+    txt_clip = ImageClip(sprite).set_duration(duration).set_position(position)
+    
+    # Composite
+    layers = [base_clip, txt_clip]
+    if overlays:
+        layers += overlays.to_clips()
+    video = CompositeVideoClip(layers)
+    video = video.set_audio(audio)
+    video = video.set_duration(duration)
+    return video, raw_video
+
+def _close_raw_video(raw_video):
+    # Explicitly close the raw video reader to avoid file locks
+    if raw_video is None:
+        return
+    try:
+        raw_video.reader.close()
+        if raw_video.audio: raw_video.audio.reader.close_proc()
+    except: pass
+
+def _timed_frames(clip, timer):
+    """
+    Wraps clip so the time spent producing each frame (decoding, resizing, blending) is booked
+    to the timer's composite stage; the rest of write_videofile is the encoder's.
+    """
+    def timed(get_frame, t):
+        with timer.stage("composite"):
+            return get_frame(t)
+    return clip.fl(timed, apply_to=[])
+
+def _render_composited_scene(audio, duration, image_path, subtitle_text, output_path, resolution, fontsize, color, video_clip_path, settings, threads, pingpong=False, overlays=None, frame_cache=None, timer=None):
+    """
+    Composites one scene with MoviePy and encodes it.
+    """
+    timer = timer or RenderTimer("scene")
+    with timer.stage("media_load"):
+        video, raw_video = _build_composited_clip(audio, duration, image_path, subtitle_text, resolution,
+                                                  fontsize, color, video_clip_path, pingpong=pingpong, overlays=overlays,
+                                                  frame_cache=frame_cache)
+    
+    # Write file
+    composite_before = timer.stages.get("composite", 0.0)
+    start = time.perf_counter()
+    _timed_frames(video, timer).write_videofile(
+        output_path, fps=settings["fps"], codec=SCENE_CODEC, audio_codec=SCENE_AUDIO_CODEC,
+        preset=settings["preset"], threads=threads,
+        ffmpeg_params=["-crf", str(settings["crf"]),
+                       "-force_key_frames", f"expr:gte(t,n_forced*{SCENE_KEYFRAME_INTERVAL})"],
+        verbose=False, logger=None)
+    timer.add("encode", time.perf_counter() - start - (timer.stages["composite"] - composite_before))
+    
+    # Close clips to release resources
+    _close_raw_video(raw_video)
+
+def _render_piped_scene(audio_path, duration, image_path, subtitle_text, output_path, resolution, fontsize, color, video_clip_path, settings, threads, pingpong=False, overlays=None, frame_cache=None, timer=None):
+    """
+    Pipe backend: one ffmpeg encoder fed from a preallocated frame buffer. The base picture is
+    copied in and the subtitle sprite blended over its box in place, with no per-frame allocations.
+    """
+    timer = timer or RenderTimer("scene")
+    with timer.stage("text_raster"):
+        sprite, position = render_subtitle_sprite(subtitle_text, size=resolution, fontsize=fontsize, color=color)
+        layers = [SpriteLayer(sprite, position, resolution)]
+    encoder_args = ["-force_key_frames", f"expr:gte(t,n_forced*{SCENE_KEYFRAME_INTERVAL})"] + _x264_args(settings)
+
+    reader = None
+    with timer.stage("media_load"):
         if video_clip_path and os.path.exists(video_clip_path):
-             # Explicitly close the raw video reader to avoid file locks
-             try:
-                 raw_video.reader.close()
-                 if raw_video.audio: raw_video.audio.reader.close_proc()
-             except: pass
+            clip_buffer = load_clip_buffer(video_clip_path, resolution, cache=frame_cache)
+            if clip_buffer is not None:
+                fill_base = lambda frame, t: np.copyto(frame, clip_buffer.get_frame(t, pingpong))
+            else:
+                # Long clip: decode it alongside the encoder (decoding is booked to composite)
+                params = probe_media(video_clip_path)
+                reader = StreamedClipReader(video_clip_path, resolution, settings["fps"], size=(params["width"], params["height"]))
+                fill_base = lambda frame, t: reader.read_into(frame)
+        else:
+            base = np.asarray(_fitted_base_image(image_path, resolution, frame_cache=frame_cache).convert("RGB"))
+            fill_base = lambda frame, t: np.copyto(frame, base)
+
+    try:
+        start = time.perf_counter()
+        with FramePipeWriter(output_path, resolution, settings["fps"], audio_path=audio_path, duration=duration,
+                             codec=SCENE_CODEC, audio_codec=SCENE_AUDIO_CODEC, encoder_args=encoder_args,
+                             threads=threads) as writer:
+            composite = render_frames(writer, duration, settings["fps"], fill_base, layers, overlays=overlays)
+        timer.add("composite", composite)
+        timer.add("encode", time.perf_counter() - start - composite)
+    finally:
+        if reader is not None:
+            reader.close()
+
+def _render_still_windows(frame, overlays, audio_path, duration, output_path, settings, threads=None, timer=None):
+    """
+    Still scene with timed overlays: one frame is pre-composited per overlay window and
+    streamed to the encoder, so no blending happens per output frame.
+    """
+    timer = timer or RenderTimer("scene")
+    window_frames = []
+    with timer.stage("composite"):
+        for window in overlays.windows:
+            composed = frame.copy()
+            for i in window:
+                overlays.items[i]["layer"].blit(composed)
+            window_frames.append(composed)
+
+    def fill_base(out, t):
+        i = overlays.window_index(t)
+        np.copyto(out, frame if i is None else window_frames[i])
+
+    encoder_args = ["-tune", "stillimage", "-force_key_frames", f"expr:gte(t,n_forced*{SCENE_KEYFRAME_INTERVAL})"] + _x264_args(settings)
+    start = time.perf_counter()
+    with FramePipeWriter(output_path, (frame.shape[1], frame.shape[0]), settings["fps"], audio_path=audio_path,
+                         duration=duration, codec=SCENE_CODEC, audio_codec=SCENE_AUDIO_CODEC,
+                         encoder_args=encoder_args, threads=threads) as writer:
+        composite = render_frames(writer, duration, settings["fps"], fill_base)
+    timer.add("composite", composite)
+    timer.add("encode", time.perf_counter() - start - composite)
+
+def _prepare_scene_media(image_path, video_clip_path, resolution, settings, normalize_media=True):
+    """
+    Resolves which media a scene renders from. Returns (image_path, video_clip_path, has_motion),
+    with paths swapped for pre-fitted copies when normalize_media is set.
+    """
+    has_motion = bool(video_clip_path and os.path.exists(video_clip_path))
+    if normalize_media:
+        if has_motion:
+            video_clip_path = normalize_clip(video_clip_path, resolution, fps=settings["fps"])
+        elif image_path and os.path.exists(image_path):
+            image_path = normalize_image(image_path, resolution)
+    return image_path, video_clip_path, has_motion
+
+def render_scene_video(image_path, audio_path, subtitle_text, output_path, resolution=(1080, 1920), fontsize=70, color='white', video_clip_path=None, threads=None, cache=None, still_fast_path=True, pingpong=False, normalize_media=True, profile=DEFAULT_RENDER_PROFILE, backend=DEFAULT_RENDER_BACKEND, overlays=None, frame_cache=None, stats=None, stats_path=None):
+    """
+    Renders a single scene video: Image/Video + Audio + Subtitle.
+    Resolution determines aspect ratio (e.g. 1080x1920 for 9:16, 1920x1080 for 16:9).
+    threads limits the encoder threads (used by the batch renderer to share CPUs between scenes).
+    cache (a DiskCache, e.g. get_render_cache()) returns a previous render of identical inputs instead of re-encoding.
+    still_fast_path: scenes without AI motion are composited once and encoded as a still image
+    instead of being re-blended by MoviePy on every frame.
+    pingpong: loop a short AI clip back and forth instead of jumping back to its first frame.
+    normalize_media: render from pre-fitted copies of the image/clip (see services/ingest.py),
+    converted once per source and cached, instead of resampling on every render.
+    profile: a RENDER_PROFILES name; "draft" renders a scaled-down, low-fps preview fast.
+    backend: how composited (motion) scenes are rendered, one of RENDER_BACKENDS.
+    overlays: timed text overlays (schema_v32.Overlay objects or dicts with text, start_sec,
+    end_sec and position), drawn only while active.
+    frame_cache (a DiskCache, e.g. frame_cache.get_frame_cache()) keeps the fitted image/short-clip
+    frames memory-mapped on disk, so a subtitle or overlay edit only re-blends text and re-encodes.
+    stats: optional dict, filled with the render's per-stage seconds, frame rates and encoder
+    statistics (see services/render_stats.py). The same record is appended as a JSON line to
+    stats_path, or to RENDER_STATS_PATH when that is set.
+    """
+    timer = RenderTimer("scene", output=output_path, profile=profile, backend=backend)
+    result = _render_scene_video(image_path, audio_path, subtitle_text, output_path, resolution, fontsize, color,
+                                 video_clip_path, threads, cache, still_fast_path, pingpong, normalize_media, profile,
+                                 backend, overlays, frame_cache, timer)
+    report = timer.report(success=result[0])
+    if result[0]:
+        report.update(encoder_stats(output_path, report.get("duration")))
+    if stats is not None:
+        stats.update(report)
+    write_stats(report, stats_path)
+    return result
+
+def _render_scene_video(image_path, audio_path, subtitle_text, output_path, resolution, fontsize, color, video_clip_path, threads, cache, still_fast_path, pingpong, normalize_media, profile, backend, overlays, frame_cache, timer):
+    try:
+        if backend not in RENDER_BACKENDS:
+            return False, f"Unknown render backend: {backend}"
+        cache_key = None
+        if cache is not None:
+            with timer.stage("cache_lookup"):
+                cache_key = scene_render_key(image_path, audio_path, subtitle_text, resolution, fontsize, color, video_clip_path,
+                                             still_fast_path, pingpong, normalize_media, profile, backend, overlays)
+                cached_path = cache.get(cache_key)
+                if cached_path:
+                    shutil.copyfile(cached_path, output_path)
+            if cached_path:
+                timer.fields["path"] = "cached"
+                return True, output_path
+
+        settings = get_render_profile(profile)
+        resolution = scale_resolution(resolution, settings["scale"])
+        fontsize = max(1, int(round(fontsize * settings["scale"])))
+
+        # Voice duration from the timing sidecar or the MP3/WAV headers (no ffmpeg probe)
+        with timer.stage("audio_probe"):
+            duration = voice_duration(audio_path)
+        timer.fields.update(duration=round(duration, 3), fps=settings["fps"], resolution=list(resolution),
+                            frames=frame_count(duration, settings["fps"]))
+
+        with timer.stage("normalize"):
+            image_path, video_clip_path, has_motion = _prepare_scene_media(image_path, video_clip_path, resolution,
+                                                                           settings, normalize_media=normalize_media)
+
+        with timer.stage("text_raster"):
+            overlay_track = OverlayTrack(overlays, resolution, fontsize=fontsize, color=color, duration=duration)
+
+        if still_fast_path and not has_motion:
+            timer.fields["path"] = "still"
+            frame = compose_still_frame(image_path, subtitle_text, resolution=resolution, fontsize=fontsize, color=color,
+                                        frame_cache=frame_cache, timer=timer)
+            if overlay_track:
+                _render_still_windows(frame, overlay_track, audio_path, duration, output_path, settings, threads=threads,
+                                      timer=timer)
+            else:
+                with timer.stage("encode"):
+                    _encode_still_scene(frame, audio_path, duration, output_path, settings, threads=threads)
+        elif backend == "pipe":
+            timer.fields["path"] = "pipe"
+            _render_piped_scene(audio_path, duration, image_path, subtitle_text, output_path, resolution,
+                                fontsize, color, video_clip_path, settings, threads, pingpong=pingpong,
+                                overlays=overlay_track, frame_cache=frame_cache, timer=timer)
+        else:
+            timer.fields["path"] = "moviepy"
+            # Only the MoviePy path decodes the voice through a clip
+            with timer.stage("media_load"):
+                audio = AudioFileClip(audio_path)
+            try:
+                _render_composited_scene(audio, duration, image_path, subtitle_text, output_path, resolution,
+                                         fontsize, color, video_clip_path, settings, threads, pingpong=pingpong,
+                                         overlays=overlay_track, frame_cache=frame_cache, timer=timer)
+            finally:
+                audio.close()
+
+        if cache is not None:
+            with timer.stage("cache_store"):
+                cache.put(cache_key, output_path)
 
         return True, output_path
     
@@ -136,38 +462,336 @@ def render_scene_video(image_path, audio_path, subtitle_text, output_path, resol
         print(f"Error rendering scene: {e}")
         return False, str(e)
 
-def assemble_full_movie(scene_videos, output_path, bg_music_path=None, transition_duration=0.5):
+def _stream_copy_incompatibility(params_list):
     """
-    Concatenates rendered scene videos into a final movie.
-    Adds background music (looped/ducked) and simple crossfade transitions if supported.
+    Returns why the scenes can't be joined without re-encoding, or None if they can.
+    """
+    keys = ("video_codec", "width", "height", "fps", "pix_fmt", "audio_codec", "sample_rate", "channels")
+    first = params_list[0]
+    if first["video_codec"] != "h264":
+        return f"unsupported video codec {first['video_codec']}"
+    if first["audio_codec"] is None:
+        return "scene has no audio stream"
+    for params in params_list[1:]:
+        for key in keys:
+            if params[key] != first[key]:
+                return f"scenes differ in {key} ({first[key]} vs {params[key]})"
+    return None
+
+def _copy_range(video, start, end, fps, output_path):
+    """
+    Keyframe-to-keyframe video copy; cut by frame count, -t would round to extra packets.
     """
+    run_ffmpeg(["-ss", f"{start}", "-i", video, "-frames:v", str(round((end - start) * fps)),
+                "-an", "-c:v", "copy", output_path])
+
+def _dip_segments(scene_videos, params_list, fade, fps, encode_args, work_dir):
+    """
+    Per scene: fade-in head and fade-out tail re-encoded up to the nearest keyframes, middle copied.
+    """
+    segments = []
+    for i, (video, params) in enumerate(zip(scene_videos, params_list)):
+        duration = params["duration"]
+        keyframes = keyframe_times(video)
+        head_end = next((t for t in keyframes if t >= fade), None)
+        tail_start = next((t for t in reversed(keyframes) if t <= duration - fade), None)
+
+        if head_end is None or tail_start is None or head_end >= tail_start:
+            # No copyable middle part: re-encode the whole (short) scene with both fades
+            seg = os.path.join(work_dir, f"scene{i}_full.mp4")
+            run_ffmpeg(["-i", video, "-vf", f"fade=t=in:st=0:d={fade},fade=t=out:st={duration - fade}:d={fade}"] + encode_args + [seg])
+            segments.append(seg)
+            continue
+
+        head = os.path.join(work_dir, f"scene{i}_head.mp4")
+        run_ffmpeg(["-i", video, "-frames:v", str(round(head_end * fps)), "-vf", f"fade=t=in:st=0:d={fade}"] + encode_args + [head])
+        mid = os.path.join(work_dir, f"scene{i}_mid.mp4")
+        _copy_range(video, head_end, tail_start, fps, mid)
+        tail = os.path.join(work_dir, f"scene{i}_tail.mp4")
+        run_ffmpeg(["-ss", f"{tail_start}", "-i", video,
+                     "-vf", f"fade=t=out:st={duration - fade - tail_start}:d={fade}"] + encode_args + [tail])
+        segments += [head, mid, tail]
+    return segments
+
+def _crossfade_segments(scene_videos, params_list, overlap, fps, encode_args, work_dir):
+    """
+    Only each join is re-encoded: the outgoing scene from its last keyframe before the overlap
+    and the incoming scene up to its first keyframe after it, blended with xfade.
+    Everything else is copied. Raises ValueError if a scene is too short to keep a copied middle.
+    """
+    last = len(scene_videos) - 1
+    ranges = []
+    for i, (video, params) in enumerate(zip(scene_videos, params_list)):
+        duration = params["duration"]
+        keyframes = keyframe_times(video)
+        copy_start = 0.0 if i == 0 else next((t for t in keyframes if t >= overlap), None)
+        copy_end = duration if i == last else next((t for t in reversed(keyframes) if t <= duration - overlap), None)
+        if copy_start is None or copy_end is None or copy_start >= copy_end:
+            raise ValueError(f"scene {i + 1} is too short to crossfade without re-encoding")
+        ranges.append((copy_start, copy_end))
+
+    segments = []
+    for i, video in enumerate(scene_videos):
+        copy_start, copy_end = ranges[i]
+        if i > 0:
+            prev, (_, prev_end) = scene_videos[i - 1], ranges[i - 1]
+            outgoing = params_list[i - 1]["duration"] - prev_end
+            join = os.path.join(work_dir, f"join{i}.mp4")
+            run_ffmpeg(["-ss", f"{prev_end}", "-i", prev, "-i", video, "-filter_complex",
+                        f"[0:v]setpts=PTS-STARTPTS,fps={fps:g}[a];"
+                        f"[1:v]trim=end_frame={round(copy_start * fps)},setpts=PTS-STARTPTS,fps={fps:g}[b];"
+                        f"[a][b]xfade=transition=fade:duration={overlap}:offset={outgoing - overlap}[v]",
+                        "-map", "[v]"] + encode_args + [join])
+            segments.append(join)
+        mid = os.path.join(work_dir, f"scene{i}_mid.mp4")
+        _copy_range(video, copy_start, copy_end, fps, mid)
+        segments.append(mid)
+    return segments
+
+def _assemble_stream_copy(scene_videos, params_list, output_path, bg_music_path=None, transition=DEFAULT_TRANSITION, transition_duration=0.5, settings=None, timer=None):
+    """
+    Joins compatible scenes with the ffmpeg concat demuxer.
+    Only the transition windows (up to the nearest keyframe) are re-encoded; everything between is stream-copied.
+    Segments stay in mp4: the demuxer's auto_convert keeps each segment's own SPS/PPS in-band.
+    Voice audio is copied as-is unless background music or crossfades have to be mixed in
+    (music is mixed and ducked by services/mixer.py).
+    """
+    timer = timer or RenderTimer("movie")
+    work_dir = tempfile.mkdtemp(prefix="assemble_")
     try:
-        clips = []
-        for v in scene_videos:
-            clip = VideoFileClip(v)
-            # Add simple fadein/out for smoothness
-            clip = clip.fadein(0.2).fadeout(0.2)
-            clips.append(clip)
-            
-        final_video = concatenate_videoclips(clips, method="compose") # compose supports potential overlaps/transitions better
-        
-        # Background Music
-        if bg_music_path and os.path.exists(bg_music_path):
-            bg_music = AudioFileClip(bg_music_path)
-            # Loop bg_music to match video duration
-            if bg_music.duration < final_video.duration:
-                 bg_music = bg_music.loop(duration=final_video.duration)
+        fps = params_list[0]["fps"]
+        settings = settings or get_render_profile()
+        encode_args = ["-an", "-c:v", SCENE_CODEC, "-pix_fmt", params_list[0]["pix_fmt"], "-r", f"{fps:g}"] + _x264_args(settings)
+        window = transition_window(transition, [p["duration"] for p in params_list], transition_duration)
+        crossfade = transition == "crossfade" and window > 0 and len(scene_videos) > 1
+
+        with timer.stage("transitions"):
+            if crossfade:
+                segments = _crossfade_segments(scene_videos, params_list, window, fps, encode_args, work_dir)
+            elif transition == "dip_to_black" and window > 0:
+                segments = _dip_segments(scene_videos, params_list, window / 2, fps, encode_args, work_dir)
             else:
-                 bg_music = bg_music.subclip(0, final_video.duration)
-                 
-            # Ducking: Bg music should be quieter (e.g. 20%)
-            bg_music = bg_music.volumex(0.2)
-            
-            # Mix with original audio (Voice)
-            final_audio = CompositeAudioClip([final_video.audio, bg_music])
-            final_video = final_video.set_audio(final_audio)
-        
-        final_video.write_videofile(output_path, fps=24, codec='libx264', audio_codec='aac')
+                # Plain cuts: the scene files themselves are the segments
+                segments = list(scene_videos)
+
+        video_list = os.path.join(work_dir, "video.txt")
+        with open(video_list, "w", encoding="utf-8") as f:
+            f.writelines(f"file '{os.path.abspath(seg)}'\n" for seg in segments)
+        args = ["-f", "concat", "-safe", "0", "-i", video_list]
+
+        if bg_music_path and os.path.exists(bg_music_path):
+            # Voices (overlapping like the pictures on crossfades) + music ducked under them,
+            # mixed to one track (audio-only re-encode)
+            with timer.stage("mix_audio"):
+                mix_path = mixdown(scene_videos, os.path.join(work_dir, "mix.wav"), crossfade=window if crossfade else 0.0,
+                                   bg_music_path=bg_music_path)
+            args += ["-i", mix_path, "-map", "0:v", "-map", "1:a", "-c:v", "copy", "-c:a", SCENE_AUDIO_CODEC]
+        elif crossfade:
+            # Voices overlap by the same amount as the pictures
+            filters = []
+            for v in scene_videos:
+                args += ["-i", v]
+            voice = "[1:a]"
+            for i in range(2, len(scene_videos) + 1):
+                filters.append(f"{voice}[{i}:a]acrossfade=d={window}[x{i}]")
+                voice = f"[x{i}]"
+            args += ["-filter_complex", ";".join(filters), "-map", "0:v", "-map", voice, "-c:v", "copy", "-c:a", SCENE_AUDIO_CODEC]
+        else:
+            audio_list = os.path.join(work_dir, "audio.txt")
+            with open(audio_list, "w", encoding="utf-8") as f:
+                f.writelines(f"file '{os.path.abspath(v)}'\n" for v in scene_videos)
+            args += ["-f", "concat", "-safe", "0", "-i", audio_list, "-map", "0:v", "-map", "1:a", "-c", "copy"]
+        with timer.stage("mux"):
+            run_ffmpeg(args + ["-movflags", "+faststart", output_path])
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def assemble_full_movie(scene_videos, output_path, bg_music_path=None, transition_duration=0.5, mode="auto", profile=DEFAULT_RENDER_PROFILE, transition=DEFAULT_TRANSITION, max_open_scenes=MAX_OPEN_SCENES, usage=None, stats=None, stats_path=None):
+    """
+    Concatenates rendered scene videos into a final movie.
+    Adds background music (looped/ducked) and transitions between scenes.
+    mode: "auto" joins scenes that share codec/resolution/fps/audio parameters without
+    re-encoding them and falls back to the MoviePy re-encode otherwise, "copy" requires
+    the stream-copy path, "reencode" always re-encodes with MoviePy.
+    profile: RENDER_PROFILES name whose encoder settings (and fps, when re-encoding) are used.
+    transition: one of transitions.TRANSITIONS, lasting transition_duration seconds; only the
+    frames inside transition windows are blended (or re-encoded, when stream-copying).
+    max_open_scenes: scene readers kept open at once when re-encoding (see services/streaming.py).
+    usage: optional dict, filled with the render's peak RSS and open file descriptors.
+    stats: optional dict, filled with per-stage seconds (probe, transitions / mix_audio / mux when
+    stream-copying, mix_audio / composite / encode when re-encoding), frame rates, encoder statistics
+    and the usage figures; also appended as a JSON line to stats_path or RENDER_STATS_PATH.
+    """
+    timer = RenderTimer("movie", output=output_path, profile=profile, transition=transition, scenes=len(scene_videos))
+    with ResourceMonitor() as monitor:
+        result = _assemble_full_movie(scene_videos, output_path, bg_music_path, transition_duration, mode,
+                                      profile, transition, max_open_scenes, timer)
+    report = timer.report(success=result[0], **monitor.report())
+    if result[0]:
+        report.update(encoder_stats(output_path, report.get("duration")))
+    if usage is not None:
+        usage.update(monitor.report())
+    if stats is not None:
+        stats.update(report)
+    write_stats(report, stats_path)
+    return result
+
+def _assemble_full_movie(scene_videos, output_path, bg_music_path, transition_duration, mode, profile, transition, max_open_scenes, timer):
+    try:
+        settings = get_render_profile(profile)
+        transition_window(transition, [], transition_duration)  # validates the name
+        if mode != "reencode":
+            with timer.stage("probe"):
+                params_list = [probe_media(v) for v in scene_videos]
+            reason = _stream_copy_incompatibility(params_list)
+            if reason is None:
+                try:
+                    _assemble_stream_copy(scene_videos, params_list, output_path, bg_music_path=bg_music_path,
+                                          transition=transition, transition_duration=transition_duration, settings=settings,
+                                          timer=timer)
+                    # Only the transition windows were encoded, so no frame rate; duration for the bitrate
+                    timer.fields.update(path="copy", duration=probe_media(output_path)["duration"])
+                    return True, output_path
+                except ValueError as e:
+                    reason = str(e)
+            if mode == "copy":
+                return False, f"Stream copy not possible: {reason}"
+            print(f"Stream copy not possible ({reason}), re-encoding movie.")
+
+        work_dir = tempfile.mkdtemp(prefix="assemble_")
+        # Scene readers are opened as the timeline reaches them and closed behind it
+        timer.fields["path"] = "reencode"
+        with ScenePool(max_open_scenes) as pool:
+            try:
+                with timer.stage("probe"):
+                    params_list = [probe_media(v) for v in scene_videos]
+                # Scenes of another size are fitted (cover + center crop) to the first scene's frame
+                resolution = (params_list[0]["width"], params_list[0]["height"])
+                clips = [StreamedScene(pool, params["duration"], partial(_open_scene_video, v, resolution))
+                         for v, params in zip(scene_videos, params_list)]
+                timeline = TransitionTimeline(clips, transition=transition, transition_duration=transition_duration, fps=settings["fps"])
+                timer.fields.update(duration=round(timeline.duration, 3), fps=settings["fps"],
+                                    frames=frame_count(timeline.duration, settings["fps"]))
+                # Voices + ducked background music, mixed in NumPy
+                with timer.stage("mix_audio"):
+                    audio_path = _mix_timeline_audio(timeline, scene_videos, bg_music_path, work_dir)
+                # Scene decoding and blending are booked to composite, the rest of the write to encode
+                start = time.perf_counter()
+                try:
+                    _timed_frames(timeline.to_clip(), timer).write_videofile(
+                        output_path, fps=settings["fps"], codec=SCENE_CODEC, audio=audio_path,
+                        preset=settings["preset"], ffmpeg_params=["-crf", str(settings["crf"])])
+                except Exception:
+                    # Don't leave a truncated movie behind
+                    if os.path.exists(output_path):
+                        os.remove(output_path)
+                    raise
+                timer.add("encode", time.perf_counter() - start - timer.stages.get("composite", 0.0))
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
         return True, output_path
     except Exception as e:
          return False, str(e)
+
+def _open_scene_video(path, resolution=None):
+    clip = VideoFileClip(path, audio=False)
+    if resolution is None or tuple(clip.size) == tuple(resolution):
+        return clip, [clip]
+    fitted = clip.fl_image(lambda frame: np.asarray(fit_image(Image.fromarray(frame), resolution)))
+    fitted.size = tuple(resolution)
+    return fitted, [clip]
+
+def mix_timeline_voices(timeline, voice_paths, bg_music_path, output_path):
+    """
+    Writes the timeline's sound as one WAV: each scene's voice (voice_paths, in scene order) at its
+    start on the timeline, faded over crossfades, plus the background music (looped or trimmed)
+    ducked under the voice. See services/mixer.py.
+    """
+    if not (bg_music_path and os.path.exists(bg_music_path)):
+        bg_music_path = None
+    crossfade = timeline.transition_duration if timeline.transition == "crossfade" else 0.0
+    return mixdown(voice_paths, output_path, starts=timeline.starts, crossfade=crossfade,
+                   duration=timeline.duration, bg_music_path=bg_music_path)
+
+def _mix_timeline_audio(timeline, voice_paths, bg_music_path, work_dir):
+    """
+    mix_timeline_voices encoded for muxing by write_videofile. Returns the audio file path.
+    """
+    wav_path = mix_timeline_voices(timeline, voice_paths, bg_music_path, os.path.join(work_dir, "mix.wav"))
+    audio_path = os.path.join(work_dir, "mix.m4a")
+    run_ffmpeg(["-i", wav_path, "-c:a", SCENE_AUDIO_CODEC, audio_path])
+    return audio_path
+
+def render_movie_direct(scenes, output_path, resolution=(1080, 1920), fontsize=70, color='white', bg_music_path=None,
+                        profile=DEFAULT_RENDER_PROFILE, pingpong=False, normalize_media=True, threads=None,
+                        transition=DEFAULT_TRANSITION, transition_duration=0.5, max_open_scenes=MAX_OPEN_SCENES, usage=None):
+    """
+    Renders the whole movie straight from the scene sources in one encode, skipping the
+    intermediate scene_{id}.mp4 files (each frame is encoded once instead of twice).
+    scenes: dicts with image_path, audio_path, subtitle_text and optional video_clip_path and overlays
+    (render_batch.build_scene_jobs output works as is; extra keys are ignored).
+    Scenes are joined with the same transitions as assemble_full_movie, then voice and background music are mixed.
+    Scene media (clip readers, frame buffers, composited frames) is loaded as the timeline reaches
+    it, at most max_open_scenes at a time, so memory does not grow with the number of scenes.
+    usage: optional dict, filled with the render's peak RSS and open file descriptors.
+    """
+    with ResourceMonitor() as monitor:
+        result = _render_movie_direct(scenes, output_path, resolution, fontsize, color, bg_music_path, profile,
+                                      pingpong, normalize_media, threads, transition, transition_duration, max_open_scenes)
+    if usage is not None:
+        usage.update(monitor.report())
+    return result
+
+def _open_direct_scene(scene, duration, resolution, fontsize, color, settings, pingpong, normalize_media):
+    """
+    Builds one scene's clip for render_movie_direct. Returns (clip, resources to close).
+    """
+    image_path, video_clip_path, has_motion = _prepare_scene_media(
+        scene.get("image_path"), scene.get("video_clip_path"), resolution, settings,
+        normalize_media=normalize_media)
+    overlay_track = OverlayTrack(scene.get("overlays"), resolution, fontsize=fontsize, color=color, duration=duration)
+
+    if has_motion:
+        clip, raw_video = _build_composited_clip(None, duration, image_path, scene.get("subtitle_text", ""),
+                                                 resolution, fontsize, color, video_clip_path, pingpong=pingpong,
+                                                 overlays=overlay_track)
+        return clip, [partial(_close_raw_video, raw_video)]
+
+    # Stills are a single pre-composited frame, as in the scene fast path
+    frame = compose_still_frame(image_path, scene.get("subtitle_text", ""), resolution, fontsize, color)
+    clip = ImageClip(frame).set_duration(duration)
+    if overlay_track:
+        clip = CompositeVideoClip([clip] + overlay_track.to_clips()).set_duration(duration)
+    return clip, []
+
+def _render_movie_direct(scenes, output_path, resolution, fontsize, color, bg_music_path, profile, pingpong,
+                         normalize_media, threads, transition, transition_duration, max_open_scenes):
+    settings = get_render_profile(profile)
+    scale = settings["scale"]
+    resolution = scale_resolution(resolution, scale)
+    fontsize = max(1, int(round(fontsize * scale)))
+
+    try:
+        if not scenes:
+            return False, "No scenes to render"
+        with ScenePool(max_open_scenes) as pool:
+            clips = []
+            for scene in scenes:
+                duration = voice_duration(scene["audio_path"])
+                clips.append(StreamedScene(pool, duration, partial(
+                    _open_direct_scene, scene, duration, resolution, fontsize, color, settings, pingpong, normalize_media)))
+
+            timeline = TransitionTimeline(clips, transition=transition, transition_duration=transition_duration, fps=settings["fps"])
+            work_dir = tempfile.mkdtemp(prefix="direct_")
+            try:
+                audio_path = _mix_timeline_audio(timeline, [scene["audio_path"] for scene in scenes], bg_music_path, work_dir)
+                timeline.to_clip().write_videofile(output_path, fps=settings["fps"], codec=SCENE_CODEC, audio=audio_path,
+                                                   preset=settings["preset"], threads=threads,
+                                                   ffmpeg_params=["-crf", str(settings["crf"]), "-movflags", "+faststart"],
+                                                   verbose=False, logger=None)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        return True, output_path
+    except Exception as e:
+        print(f"Error rendering movie: {e}")
+        return False, str(e)
@@ -0,0 +1,148 @@
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services import audio, tts_backends
+from ai_movie_maker.services.disk_cache import DiskCache
+from ai_movie_maker.services.media_io import probe_media
+from ai_movie_maker.services.speech_timing import load_speech_timing, voice_duration
+
+class _FakeCommunicate:
+    calls = []
+
+    def __init__(self, text, voice, pitch="+0Hz", rate="+0%", boundary="SentenceBoundary"):
+        self.args = (text, voice, pitch, rate)
+        self.boundary = boundary
+
+    async def stream(self):
+        _FakeCommunicate.calls.append(self.args)
+        # 0.5 s of 48 kbit/s audio in two chunks, one word boundary per word
+        yield {"type": "audio", "data": b"\xff" * 1500}
+        for i, word in enumerate(self.args[0].split()):
+            if self.boundary == "WordBoundary":
+                yield {"type": "WordBoundary", "offset": i * 1_500_000, "duration": 1_000_000, "text": word}
+        yield {"type": "audio", "data": b"\xff" * 1500}
+
+class TestAudioBatch(unittest.TestCase):
+    def test_lines_are_voiced_concurrently_with_per_item_errors(self):
+        in_flight = []
+        peak = []
+
+        async def fake_tts(text, voice_style, output_file, backend=None):
+            in_flight.append(output_file)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.2)
+            in_flight.remove(output_file)
+            if text == "bad":
+                raise RuntimeError("throttled")
+
+        items = [{"scene_id": i, "text": "bad" if i == 2 else f"line {i}", "voice_style": "Male - Default",
+                  "output_path": f"audio_scene_{i}.mp3"} for i in range(6)]
+        start = time.time()
+        with mock.patch.object(audio, "generate_audio_async", fake_tts):
+            results = audio.generate_audio_batch(items, concurrency=3)
+        elapsed = time.time() - start
+
+        self.assertEqual([r["scene_id"] for r in results], list(range(6)))
+        self.assertEqual(max(peak), 3)
+        self.assertLess(elapsed, 0.2 * 6 / 2)  # two waves of three, not six lines in a row
+        self.assertFalse(results[2]["success"])
+        self.assertEqual(results[2]["error"], "throttled")
+        self.assertEqual(results[3]["output_path"], "audio_scene_3.mp3")
+
+class TestTTSCache(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.cache = DiskCache(os.path.join(self.work_dir, "tts"))
+        _FakeCommunicate.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _say(self, text, style, name, **kwargs):
+        path = os.path.join(self.work_dir, name)
+        kwargs.setdefault("backend", "edge")
+        asyncio.run(audio.generate_audio_async(text, style, path, cache=self.cache, **kwargs))
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_repeated_lines_are_synthesized_once(self):
+        with mock.patch.object(tts_backends.edge_tts, "Communicate", _FakeCommunicate):
+            first = self._say("Xin chào  bạn", "Female - Soft", "a.mp3")
+            again = self._say(" Xin chào bạn\n", "Female - Soft", "b.mp3")
+            self._say("Xin chào bạn", "Male - Deep", "c.mp3")
+            self._say("Xin chào bạn", "Female - Soft", "d.mp3", use_cache=False)
+        self.assertEqual(first, again)
+        self.assertEqual(len(_FakeCommunicate.calls), 3)  # the whitespace variant was a hit
+        # One lookup and one entry per line: a, b (hit) and c
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 2, 2))
+        # The cache hit comes with the same timing sidecar as the synthesized line
+        self.assertEqual(load_speech_timing(os.path.join(self.work_dir, "b.mp3")),
+                         load_speech_timing(os.path.join(self.work_dir, "a.mp3")))
+
+    def test_word_timings_and_duration_sidecar(self):
+        with mock.patch.object(tts_backends.edge_tts, "Communicate", _FakeCommunicate):
+            self._say("Xin chào bạn", "Male - Default", "a.mp3")
+        path = os.path.join(self.work_dir, "a.mp3")
+        timing = load_speech_timing(path)
+        self.assertAlmostEqual(timing["duration"], 0.5)
+        self.assertEqual(voice_duration(path), timing["duration"])
+        self.assertEqual([w["text"] for w in timing["words"]], ["Xin", "chào", "bạn"])
+        self.assertEqual((timing["words"][1]["start"], timing["words"][1]["end"]), (0.15, 0.25))
+        # A sidecar that no longer matches its audio file is ignored
+        with open(path, "ab") as f:
+            f.write(b"\xff" * 144)
+        self.assertIsNone(load_speech_timing(path))
+
+    def test_gender_fallback(self):
+        self.assertEqual(audio.resolve_voice("Female"), audio.VOICE_MAP["Female - Default"])
+        self.assertEqual(audio.resolve_voice("male"), audio.VOICE_MAP["Male - Default"])
+
+class TestSyntheticBackend(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_offline_batch_is_deterministic_and_timed(self):
+        backend = tts_backends.SyntheticTTSBackend(latency=0.2, jitter=0)
+        text = "Xin chào các bạn. Hôm nay trời đẹp quá!"
+        items = [{"scene_id": i, "text": text, "voice_style": "Female - Soft",
+                  "output_path": os.path.join(self.work_dir, f"v{i}.mp3")} for i in range(4)]
+        start = time.time()
+        with mock.patch.object(audio, "get_tts_cache", lambda: DiskCache(os.path.join(self.work_dir, "tts"))):
+            results = audio.generate_audio_batch(items, concurrency=4, backend=backend)
+        self.assertTrue(all(r["success"] for r in results), results)
+        self.assertLess(time.time() - start, 0.2 * 4)  # latencies overlap
+
+        with open(items[0]["output_path"], "rb") as f:
+            first = f.read()
+        again, timing = asyncio.run(backend.synthesize(text, audio.resolve_voice("Female - Soft")))
+        self.assertEqual(first, again)
+        self.assertEqual(len(timing["words"]), 9)
+        self.assertTrue(2.0 < timing["duration"] < 4.5)
+        # The decoded length agrees with the sidecar duration
+        self.assertAlmostEqual(probe_media(items[0]["output_path"])["duration"], timing["duration"], delta=0.03)
+
+    def test_backends_implement_the_interface(self):
+        with self.assertRaises(TypeError):
+            tts_backends.TTSBackend()
+        for name, backend_class in tts_backends.TTS_BACKENDS.items():
+            backend = tts_backends.get_tts_backend(name)
+            self.assertIsInstance(backend, backend_class)
+            self.assertEqual(backend.name, name)
+        with self.assertRaises(ValueError):
+            tts_backends.get_tts_backend("nope")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.clip_buffer import ClipFrameBuffer
+
+class TestClipFrameBuffer(unittest.TestCase):
+    def setUp(self):
+        # 4 frames at 2 fps (2 s); frame i is filled with the value i
+        frames = np.arange(4, dtype=np.uint8)[:, None, None, None] * np.ones((1, 2, 3, 3), dtype=np.uint8)
+        self.buffer = ClipFrameBuffer(frames, fps=2)
+
+    def test_forward_loop(self):
+        indices = [self.buffer.frame_index(k / 2) for k in range(10)]
+        self.assertEqual(indices, [0, 1, 2, 3, 0, 1, 2, 3, 0, 1])
+        self.assertEqual((self.buffer.duration, self.buffer.size), (2.0, (3, 2)))
+        self.assertEqual(int(self.buffer.get_frame(2.5)[0, 0, 0]), 1)
+
+    def test_pingpong_loop(self):
+        indices = [self.buffer.frame_index(k / 2, pingpong=True) for k in range(10)]
+        self.assertEqual(indices, [0, 1, 2, 3, 2, 1, 0, 1, 2, 3])
+
+    def test_frame_boundaries_and_single_frame(self):
+        # A time just short of a frame boundary through float error (1.4999999999999998) is that frame
+        self.assertEqual(self.buffer.frame_index(3.3 - 1.8), 3)
+        self.assertEqual(self.buffer.frame_index(0.49), 0)
+        single = ClipFrameBuffer(np.zeros((1, 2, 2, 3), dtype=np.uint8), fps=24)
+        self.assertEqual({single.frame_index(t / 10, pingpong=True) for t in range(30)}, {0})
+
+if __name__ == '__main__':
+    unittest.main()
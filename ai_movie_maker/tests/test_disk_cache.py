@@ -0,0 +1,58 @@
+import sys
+import os
+import time
+import tempfile
+import shutil
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.disk_cache import DiskCache, file_digest, make_cache_key
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache = DiskCache(os.path.join(self.test_dir, "cache"), max_bytes=250, suffix=".bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _make_file(self, name, data):
+        path = os.path.join(self.test_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_hit_and_miss_counters(self):
+        self.assertIsNone(self.cache.get("a"))
+        src = self._make_file("a.bin", b"x" * 10)
+        cached = self.cache.put("a", src)
+        self.assertEqual(self.cache.get("a"), cached)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 0.5)
+
+    def test_lru_eviction_keeps_recently_used(self):
+        for key in ("a", "b"):
+            self.cache.put(key, self._make_file(f"{key}.bin", b"x" * 100))
+            time.sleep(0.05)
+        # Touch "a" so "b" becomes the least recently used entry
+        self.cache.get("a")
+        time.sleep(0.05)
+        self.cache.put("c", self._make_file("c.bin", b"x" * 100))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+        self.assertLessEqual(self.cache.stats()["size_bytes"], 250)
+
+    def test_keys_follow_content(self):
+        p1 = self._make_file("p1", b"same")
+        p2 = self._make_file("p2", b"same")
+        self.assertEqual(file_digest(p1), file_digest(p2))
+        self.assertIsNone(file_digest(None))
+        self.assertEqual(make_cache_key(a=1, b="x"), make_cache_key(b="x", a=1))
+        self.assertNotEqual(make_cache_key(text="Xin chào"), make_cache_key(text="Xin chao"))
+
+if __name__ == '__main__':
+    unittest.main()
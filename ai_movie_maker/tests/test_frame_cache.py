@@ -0,0 +1,47 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.disk_cache import DiskCache
+from ai_movie_maker.services.media_io import run_ffmpeg
+from ai_movie_maker.services.clip_buffer import load_clip_buffer
+from ai_movie_maker.services.video import _fitted_base_image
+
+class TestFrameCache(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.cache = DiskCache(os.path.join(self.work_dir, "frames"), suffix=".npy")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_clip_frames_memory_mapped_on_hit(self):
+        clip = os.path.join(self.work_dir, "clip.mp4")
+        run_ffmpeg(["-f", "lavfi", "-i", "testsrc=size=160x120:rate=6:duration=1", "-pix_fmt", "yuv420p", clip])
+        fresh = load_clip_buffer(clip, (90, 160))
+        first = load_clip_buffer(clip, (90, 160), cache=self.cache)
+        second = load_clip_buffer(clip, (90, 160), cache=self.cache)
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 1))
+        self.assertIsInstance(second.frames, np.memmap)
+        np.testing.assert_array_equal(second.frames, fresh.frames)
+        self.assertEqual((second.fps, second.size), (first.fps, (90, 160)))
+
+    def test_fitted_image_cached_per_resolution(self):
+        image = os.path.join(self.work_dir, "img.png")
+        Image.new("RGBA", (320, 240), (200, 40, 40, 128)).save(image)
+        fresh = np.asarray(_fitted_base_image(image, (100, 100)))
+        _fitted_base_image(image, (100, 100), frame_cache=self.cache)
+        cached = np.asarray(_fitted_base_image(image, (100, 100), frame_cache=self.cache))
+        np.testing.assert_array_equal(cached, fresh)
+        _fitted_base_image(image, (50, 100), frame_cache=self.cache)
+        self.assertEqual(self.cache.stats()["entries"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from PIL import Image
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.disk_cache import DiskCache
+from ai_movie_maker.services.ingest import normalize_clip, normalize_image
+from ai_movie_maker.services.media_io import probe_media, run_ffmpeg
+
+class TestIngest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_image_converted_once_per_content_and_resolution(self):
+        cache = DiskCache(os.path.join(self.work_dir, "image"), suffix=".png")
+        image = os.path.join(self.work_dir, "upload.png")
+        Image.new("RGBA", (640, 240), (200, 40, 40, 255)).save(image)
+        first = normalize_image(image, (160, 120), cache=cache)
+        with Image.open(first) as img:
+            self.assertEqual((img.size, img.mode), ((160, 120), "RGB"))
+
+        # Same bytes under another name: a hit on the same entry
+        copy = os.path.join(self.work_dir, "copy.png")
+        shutil.copyfile(image, copy)
+        self.assertEqual(normalize_image(copy, (160, 120), cache=cache), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # Another resolution is converted again
+        self.assertNotEqual(normalize_image(image, (120, 160), cache=cache), first)
+        self.assertEqual(cache.misses, 2)
+
+    def test_clip_fitted_once(self):
+        cache = DiskCache(os.path.join(self.work_dir, "clip"), suffix=".mp4")
+        clip = os.path.join(self.work_dir, "ai_clip.mp4")
+        run_ffmpeg(["-f", "lavfi", "-i", "testsrc=size=320x240:rate=30:duration=1", "-pix_fmt", "yuv420p", clip])
+        first = normalize_clip(clip, (90, 160), fps=12, cache=cache)
+        params = probe_media(first)
+        self.assertEqual((params["width"], params["height"], params["fps"], params["audio_codec"]), (90, 160, 12, None))
+        self.assertEqual(normalize_clip(clip, (90, 160), fps=12, cache=cache), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import wave
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services import media_info
+from ai_movie_maker.services.media_info import audio_info, read_audio_info
+
+# MPEG-2 Layer III, 48 kbit/s, 24 kHz mono (the TTS format): 144-byte frames of 24 ms
+TTS_FRAME = b"\xff\xf3\x64\xc0" + b"\x00" * 140
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz stereo: 417-byte frames of 1152 samples
+CD_HEADER = b"\xff\xfb\x90\x00"
+
+def _id3v2(body_size):
+    size = bytes((body_size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x03\x00\x00" + size + b"\x00" * body_size
+
+class TestMediaInfo(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.work_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_cbr_mp3_with_id3_tags(self):
+        path = self._write("voice.mp3", _id3v2(300) + TTS_FRAME * 50 + b"TAG" + b"\x00" * 125)
+        info = read_audio_info(path)
+        self.assertEqual((info["format"], info["sample_rate"], info["channels"], info["bitrate"]), ("mp3", 24000, 1, 48000))
+        self.assertAlmostEqual(info["duration"], 1.2)
+
+    def test_xing_frame_count(self):
+        xing = CD_HEADER + b"\x00" * 32 + b"Xing" + struct.pack(">II", 1, 100)
+        frame = CD_HEADER + b"\x00" * 413
+        path = self._write("vbr.mp3", xing + b"\x00" * (417 - len(xing)) + frame * 99)
+        info = read_audio_info(path)
+        self.assertEqual((info["sample_rate"], info["channels"]), (44100, 2))
+        self.assertAlmostEqual(info["duration"], 100 * 1152 / 44100)
+
+    def test_wav_and_cache_per_content(self):
+        path = os.path.join(self.work_dir, "mix.wav")
+        with wave.open(path, "wb") as w:
+            w.setnchannels(2)
+            w.setsampwidth(2)
+            w.setframerate(44100)
+            w.writeframes(b"\x00" * 4 * 22050)
+        info = audio_info(path)
+        self.assertEqual((info["format"], info["sample_rate"], info["channels"]), ("wav", 44100, 2))
+        self.assertAlmostEqual(info["duration"], 0.5)
+        # A copy with the same bytes is served from the same entry
+        copy_path = os.path.join(self.work_dir, "copy.wav")
+        shutil.copyfile(path, copy_path)
+        self.assertIs(audio_info(copy_path), info)
+        self.assertIsNone(read_audio_info(self._write("notes.txt", b"not audio at all")))
+
+    def test_lookup_caches_are_bounded(self):
+        paths = [self._write(f"v{i}.mp3", TTS_FRAME * (i + 1)) for i in range(5)]
+        with mock.patch.object(media_info, "AUDIO_INFO_CACHE_SIZE", 3), \
+                mock.patch.object(media_info, "_digests", media_info.OrderedDict()), \
+                mock.patch.object(media_info, "_infos", media_info.OrderedDict()):
+            for path in paths:
+                audio_info(path)
+            self.assertEqual((len(media_info._digests), len(media_info._infos)), (3, 3))
+            # The most recent files are still cached, the oldest were dropped
+            with mock.patch.object(media_info, "read_audio_info") as read:
+                self.assertAlmostEqual(audio_info(paths[-1])["duration"], 5 * 0.024)
+                read.assert_not_called()
+                audio_info(paths[0])
+                read.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
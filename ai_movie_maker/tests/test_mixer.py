@@ -0,0 +1,72 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.disk_cache import DiskCache
+from ai_movie_maker.services.mixer import (
+    DUCKING, MIX_SAMPLE_RATE, ducking_curve, mixdown, decode_pcm, write_wav, load_music_pcm, looped_views
+)
+
+def _tone(seconds, amplitude=0.5):
+    t = np.arange(int(seconds * MIX_SAMPLE_RATE)) / MIX_SAMPLE_RATE
+    wave = (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    return np.stack([wave, wave], axis=1)
+
+class TestMixer(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_ducking_follows_voice(self):
+        silence = np.zeros((2 * MIX_SAMPLE_RATE, 2), dtype=np.float32)
+        voice = np.concatenate([silence, _tone(1.0), silence])
+        positions, gains = ducking_curve(voice)
+        gain_at = lambda t: np.interp(t * MIX_SAMPLE_RATE, positions, gains)
+        self.assertAlmostEqual(gain_at(0.5), DUCKING["music_volume"])
+        self.assertAlmostEqual(gain_at(2.5), DUCKING["ducked_volume"])
+        self.assertAlmostEqual(gain_at(4.5), DUCKING["music_volume"])
+        # Ramps: ducking starts before the voice and recovers gradually after it
+        self.assertLess(gain_at(1.97), DUCKING["music_volume"])
+        self.assertTrue(DUCKING["ducked_volume"] < gain_at(3.0 + DUCKING["release"] / 2) < DUCKING["music_volume"])
+
+    def test_voice_shorter_than_one_window(self):
+        positions, gains = ducking_curve(_tone(DUCKING["window"] / 2))
+        self.assertEqual(len(positions), 1)
+        self.assertAlmostEqual(gains[0], DUCKING["ducked_volume"])
+
+    def test_crossfaded_voices_and_looped_music(self):
+        voice = os.path.join(self.work_dir, "voice.wav")
+        music = os.path.join(self.work_dir, "music.wav")
+        write_wav(voice, _tone(1.0))
+        write_wav(music, _tone(0.3, amplitude=0.1))
+        out = mixdown([voice, voice], os.path.join(self.work_dir, "voices.wav"), crossfade=0.25)
+        self.assertEqual(len(decode_pcm(out)), int(1.75 * MIX_SAMPLE_RATE))
+        # Music is looped to the end of the timeline, at full music volume after the voices
+        out = mixdown([voice, voice], os.path.join(self.work_dir, "mix.wav"), crossfade=0.25, duration=3.0, bg_music_path=music,
+                      music_cache=DiskCache(os.path.join(self.work_dir, "music"), suffix=".npy"))
+        tail = decode_pcm(out)[int(2.7 * MIX_SAMPLE_RATE):]
+        self.assertAlmostEqual(np.abs(tail).max(), 0.1 * DUCKING["music_volume"], delta=0.005)
+
+    def test_music_decoded_once_and_looped_by_views(self):
+        music = os.path.join(self.work_dir, "music.wav")
+        write_wav(music, _tone(0.5, amplitude=0.1))
+        cache = DiskCache(os.path.join(self.work_dir, "music"), suffix=".npy")
+        pcm = load_music_pcm(music, cache=cache)
+        self.assertIsInstance(load_music_pcm(music, cache=cache), np.memmap)
+        self.assertEqual((cache.misses, cache.stats()["entries"]), (1, 1))
+
+        pieces = list(looped_views(pcm, 1000, 1000 + 2 * len(pcm)))
+        self.assertEqual([position for position, _ in pieces], [1000, len(pcm), 2 * len(pcm)])
+        self.assertTrue(all(np.shares_memory(piece, pcm) for _, piece in pieces))
+        self.assertEqual(sum(len(piece) for _, piece in pieces), 2 * len(pcm))
+
+if __name__ == '__main__':
+    unittest.main()
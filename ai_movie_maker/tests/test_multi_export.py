@@ -0,0 +1,94 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+import numpy as np
+from PIL import Image
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.media_io import probe_media, read_video_frames, run_ffmpeg
+from ai_movie_maker.services import multi_export
+from ai_movie_maker.services.multi_export import _NativeClipStream, _SceneBranch, _SceneSource, export_multi_aspect
+from ai_movie_maker.services.streaming import ScenePool
+
+class TestMultiAspectExport(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.audio = os.path.join(self.work_dir, "voice.wav")
+        with wave.open(self.audio, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(44100)
+            w.writeframes(b"\0\0" * 44100)
+        self.image = os.path.join(self.work_dir, "img.png")
+        Image.new("RGB", (320, 240), (200, 40, 40)).save(self.image)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_one_file_per_aspect(self):
+        scenes = [{"image_path": self.image, "audio_path": self.audio, "subtitle_text": "Xin chào"}] * 2
+        outputs = {a: os.path.join(self.work_dir, f"movie_{i}.mp4") for i, a in enumerate(["16:9", "1:1"])}
+        success, result = export_multi_aspect(scenes, outputs, profile="draft")
+        self.assertTrue(success, result)
+        sizes = {a: (probe_media(p)["width"], probe_media(p)["height"]) for a, p in outputs.items()}
+        self.assertEqual(sizes, {"16:9": (960, 540), "1:1": (540, 540)})
+        self.assertAlmostEqual(probe_media(outputs["1:1"])["duration"], 2.0, delta=0.15)
+
+    def test_streamed_clip_is_the_same_for_every_target(self):
+        # 7 s at 24 fps: too long to buffer, so it is streamed. The first target reads each fade
+        # window ahead; the second must still get the window's own frames, not its last one
+        clip = os.path.join(self.work_dir, "long.mp4")
+        run_ffmpeg(["-f", "lavfi", "-i", "testsrc=size=320x240:rate=24:duration=7", "-pix_fmt", "yuv420p", clip])
+        scenes = [{"image_path": self.image, "audio_path": self.audio, "subtitle_text": ""},
+                  {"video_clip_path": clip, "audio_path": self.audio, "subtitle_text": ""}]
+        together = {"16:9": os.path.join(self.work_dir, "wide.mp4"), "1:1": os.path.join(self.work_dir, "square.mp4")}
+        alone = {"1:1": os.path.join(self.work_dir, "square_alone.mp4")}
+        for outputs in (together, alone):
+            success, result = export_multi_aspect(scenes, outputs, profile="draft", transition="dip_to_black", threads=1)
+            self.assertTrue(success, result)
+        frames, expected = read_video_frames(together["1:1"]), read_video_frames(alone["1:1"])
+        self.assertEqual(frames.shape, expected.shape)
+        self.assertLess(np.abs(frames.astype(int) - expected).max(), 8)
+
+    def test_clip_stream_keeps_recent_frames(self):
+        clip = os.path.join(self.work_dir, "clip.mp4")
+        run_ffmpeg(["-f", "lavfi", "-i", "testsrc=size=160x120:rate=12:duration=2", "-pix_fmt", "yuv420p", clip])
+        native = read_video_frames(clip)
+        stream = _NativeClipStream(clip, 12, history=4)
+        try:
+            self.assertTrue((stream.get(7) == native[7]).all())
+            self.assertTrue((stream.get(4) == native[4]).all())
+            with self.assertRaises(RuntimeError):
+                stream.get(3)
+        finally:
+            stream.close()
+
+    def test_fitted_frames_are_bounded(self):
+        clip = os.path.join(self.work_dir, "clip.mp4")
+        run_ffmpeg(["-f", "lavfi", "-i", "testsrc=size=160x120:rate=12:duration=2", "-pix_fmt", "yuv420p", clip])
+        pool = ScenePool()
+        source = _SceneSource({"video_clip_path": clip, "audio_path": self.audio, "subtitle_text": ""}, 12, pool)
+        frame = np.zeros((60, 80, 3), dtype=np.uint8)
+        original = multi_export.FITTED_CACHE_BYTES
+        multi_export.FITTED_CACHE_BYTES = 5 * frame.nbytes
+        try:
+            branch = _SceneBranch(source, (80, 60), 30, "white", frame)
+            for k in range(24):
+                branch.get_frame(k / 12)
+            self.assertEqual(len(branch.fitted), 5)
+            self.assertEqual(list(branch.fitted), list(range(19, 24)))
+        finally:
+            multi_export.FITTED_CACHE_BYTES = original
+            pool.close()
+
+    def test_unknown_aspect(self):
+        success, msg = export_multi_aspect([], {"4:3": "x.mp4"})
+        self.assertFalse(success)
+
+if __name__ == '__main__':
+    unittest.main()
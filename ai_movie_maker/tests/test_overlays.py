@@ -0,0 +1,42 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.models.schema_v32 import Overlay
+from ai_movie_maker.services.overlays import OverlayTrack
+
+class TestOverlayTrack(unittest.TestCase):
+    def setUp(self):
+        self.size = (360, 640)
+        self.track = OverlayTrack([
+            Overlay(text="Top", start_sec=1, end_sec=3, position="top"),
+            {"text": "Bottom", "start_sec": 2, "end_sec": 5, "position": "bottom"},
+        ], self.size, fontsize=30, duration=4.2)
+
+    def test_active_windows(self):
+        is_top = lambda t: [item["position"][1] < self.size[1] // 2 for item in self.track.active(t)]
+        self.assertEqual(self.track.active(0.5), [])
+        self.assertEqual(is_top(1.0), [True])
+        self.assertEqual(is_top(2.5), [True, False])
+        self.assertEqual(is_top(3.0), [False])
+        self.assertEqual(self.track.active(4.2), [])  # end clamped to the scene duration
+
+    def test_blit_only_when_active(self):
+        frame = np.zeros((self.size[1], self.size[0], 3), dtype=np.uint8)
+        self.track.blit(frame, 0.5)
+        self.assertFalse(frame.any())
+        self.track.blit(frame, 2.5)
+        top, bottom = frame[:self.size[1] // 2], frame[self.size[1] // 2:]
+        self.assertTrue(top.any() and bottom.any())
+
+    def test_empty_and_invalid_overlays(self):
+        track = OverlayTrack([{"text": "x", "start_sec": 3, "end_sec": 2, "position": "center"}], self.size)
+        self.assertFalse(track)
+        self.assertIsNone(track.window_index(2.5))
+
+if __name__ == '__main__':
+    unittest.main()
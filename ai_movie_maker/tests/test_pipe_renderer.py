@@ -0,0 +1,37 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.pipe_renderer import SpriteLayer, frame_count
+
+class TestSpriteLayer(unittest.TestCase):
+    def test_blit_matches_mask_blend(self):
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, (40, 60, 3), dtype=np.uint8)
+        sprite = rng.integers(0, 256, (10, 20, 4), dtype=np.uint8)
+        expected = frame.copy()
+        # MoviePy: mask * sprite + (1 - mask) * background, truncated to uint8
+        mask = sprite[..., 3:4] / 255.0
+        region = expected[5:15, 7:27]
+        region[...] = (mask * sprite[..., :3] + (1 - mask) * region).astype(np.uint8)
+
+        SpriteLayer(sprite, (7, 5), (60, 40)).blit(frame)
+        self.assertLessEqual(int(np.abs(frame.astype(int) - expected.astype(int)).max()), 1)
+
+    def test_blit_clips_to_frame(self):
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        sprite = np.full((4, 4, 4), 255, dtype=np.uint8)
+        SpriteLayer(sprite, (8, -2), (10, 10)).blit(frame)
+        self.assertEqual(int(frame[..., 0].astype(bool).sum()), 4)  # 2x2 visible corner
+        SpriteLayer(sprite, (20, 20), (10, 10)).blit(frame)  # fully outside: no-op
+
+    def test_frame_count_matches_moviepy(self):
+        self.assertEqual(frame_count(2.0, 24), 48)
+        self.assertEqual(frame_count(6.04, 24), 145)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+from PIL import Image
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.render_batch import render_scenes_parallel
+
+class TestParallelRender(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.audio = os.path.join(self.work_dir, "voice.wav")
+        with wave.open(self.audio, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(44100)
+            w.writeframes(b"\0\0" * 44100)
+        self.image = os.path.join(self.work_dir, "img.png")
+        Image.new("RGB", (320, 240), (200, 40, 40)).save(self.image)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _job(self, scene_id, **overrides):
+        job = {
+            "scene_id": scene_id,
+            "image_path": self.image,
+            "audio_path": self.audio,
+            "subtitle_text": f"Cảnh {scene_id}",
+            "output_path": os.path.join(self.work_dir, f"scene_{scene_id}.mp4"),
+            "resolution": (320, 240),
+            "profile": "draft",
+            "normalize_media": False,
+            "use_cache": False,
+        }
+        job.update(overrides)
+        return job
+
+    def test_results_in_job_order_with_failures_reported(self):
+        jobs = [
+            self._job(3),
+            self._job(1, audio_path=os.path.join(self.work_dir, "missing.mp3")),
+            self._job(2, backend="bogus"),
+            self._job(4, unknown_option=True),
+        ]
+        progress = []
+        results = render_scenes_parallel(jobs, max_workers=2,
+                                         progress_callback=lambda done, total, result: progress.append((done, total)))
+        self.assertEqual([r["scene_id"] for r in results], [3, 1, 2, 4])
+        self.assertEqual(sorted(progress), [(i, 4) for i in range(1, 5)])
+
+        ok, missing, failed, crashed = results
+        self.assertTrue(ok["success"], ok["error"])
+        self.assertTrue(os.path.exists(ok["output_path"]))
+        self.assertIn("encode", ok["stats"]["stages_s"])
+        self.assertFalse(missing["success"])
+        self.assertIn("Missing audio", missing["error"])
+        # render_scene_video's own error, and an exception raised inside the worker
+        self.assertFalse(failed["success"])
+        self.assertIn("Unknown render backend", failed["error"])
+        self.assertFalse(crashed["success"])
+        self.assertIn("unknown_option", crashed["error"])
+
+if __name__ == '__main__':
+    unittest.main()
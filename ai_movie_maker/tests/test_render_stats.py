@@ -0,0 +1,48 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.render_stats import RenderTimer, encoder_stats, write_stats
+
+class TestRenderStats(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_stages_accumulate_into_frame_rates(self):
+        timer = RenderTimer("scene", frames=48)
+        timer.add("composite", 0.5)
+        timer.add("composite", 0.5)
+        timer.add("encode", 1.0)
+        with timer.stage("text_raster"):
+            pass
+        report = timer.report(success=True)
+        self.assertIn("text_raster", report["stages_s"])
+        self.assertEqual(report["stages_s"]["composite"], 1.0)
+        self.assertEqual(report["render_fps"], 24.0)
+        self.assertEqual(report["encode_fps"], 48.0)
+        self.assertTrue(report["success"])
+
+    def test_reports_appended_as_json_lines(self):
+        output = os.path.join(self.work_dir, "out.mp4")
+        with open(output, "wb") as f:
+            f.write(b"\0" * 125000)
+        self.assertEqual(encoder_stats(output, 2.0), {"output_bytes": 125000, "bitrate_kbps": 500.0})
+
+        log = os.path.join(self.work_dir, "stats.jsonl")
+        for i in range(2):
+            write_stats(RenderTimer("scene", scene=i).report(), log)
+        with open(log, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["scene"] for r in records], [0, 1])
+
+if __name__ == '__main__':
+    unittest.main()
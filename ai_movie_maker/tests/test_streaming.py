@@ -0,0 +1,67 @@
+import sys
+import os
+import unittest
+from unittest import mock
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services import resources
+from ai_movie_maker.services.resources import ResourceMonitor, format_usage
+from ai_movie_maker.services.streaming import ScenePool, StreamedScene
+from ai_movie_maker.services.transitions import TransitionTimeline
+
+class _Solid:
+    def __init__(self, value):
+        self.value = value
+
+    def get_frame(self, t):
+        return np.full((4, 4, 3), self.value, dtype=np.uint8)
+
+class TestScenePool(unittest.TestCase):
+    def setUp(self):
+        self.log = []
+
+    def _scene(self, pool, i):
+        def opener():
+            self.log.append(("open", i))
+            return _Solid(i * 10), [lambda: self.log.append(("close", i))]
+        return StreamedScene(pool, 1.0, opener)
+
+    def test_timeline_keeps_at_most_two_scenes_open(self):
+        with ScenePool(2) as pool:
+            scenes = [self._scene(pool, i) for i in range(5)]
+            timeline = TransitionTimeline(scenes, transition="crossfade", transition_duration=0.5, fps=10)
+            for k in range(int(timeline.duration * 10)):
+                timeline.get_frame(k / 10)
+            self.assertEqual(pool.peak_open, 2)
+        # Every scene is opened exactly once and every one is closed again
+        self.assertEqual(sorted(i for kind, i in self.log if kind == "open"), list(range(5)))
+        self.assertEqual(sorted(i for kind, i in self.log if kind == "close"), list(range(5)))
+        self.assertIsNone(timeline.audio())
+
+    def test_monitor_reports_peaks(self):
+        with ResourceMonitor(interval=0.01) as monitor:
+            block = np.ones(8 * 1024 ** 2, dtype=np.uint8)
+            handle = open(__file__)
+        handle.close()
+        report = monitor.report()
+        self.assertGreater(report["peak_rss_mb"], 8)
+        self.assertEqual(report["leaked_fds"], 1)
+        del block
+
+    def test_monitor_without_proc_or_resource_module(self):
+        # Windows: neither /proc nor the resource module
+        with mock.patch.object(resources, "resource", None), \
+                mock.patch.object(resources, "current_rss", return_value=None):
+            with ResourceMonitor(interval=0.01) as monitor:
+                pass
+            report = monitor.report()
+            self.assertIsNone(report["peak_rss_mb"])
+            # Shown in the app without failing on the missing figure
+            self.assertTrue(format_usage(report).startswith("peak memory n/a, "))
+        self.assertEqual(format_usage({"peak_rss_mb": 120.4, "peak_open_fds": 9}), "peak memory 120 MB, 9 open files")
+
+if __name__ == '__main__':
+    unittest.main()
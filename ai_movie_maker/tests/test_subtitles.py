@@ -0,0 +1,81 @@
+import sys
+import os
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services import subtitles
+from ai_movie_maker.services.subtitles import (
+    FONT_ENV_VAR, render_subtitle_sprite, resolve_font_path, sprite_to_frame, subtitle_cache_info
+)
+
+class TestSubtitleSprites(unittest.TestCase):
+    def test_sprite_is_tight_and_inside_frame(self):
+        size = (1080, 1920)
+        sprite, (x, y) = render_subtitle_sprite("Xin chao, day la phu de", size=size, fontsize=70, color="white")
+        h, w = sprite.shape[:2]
+        self.assertEqual(sprite.shape[2], 4)
+        self.assertTrue(0 <= x and x + w <= size[0])
+        self.assertTrue(0 <= y and y + h <= size[1])
+        # Tight box: every border row/column touches visible text
+        alpha = sprite[:, :, 3]
+        self.assertTrue(alpha[0].any() and alpha[-1].any() and alpha[:, 0].any() and alpha[:, -1].any())
+        # Much smaller than a full-frame overlay
+        self.assertLess(sprite.nbytes * 10, size[0] * size[1] * 4)
+
+    def test_sprite_roundtrips_to_full_frame(self):
+        size = (1920, 1080)
+        sprite, position = render_subtitle_sprite("Two lines of subtitle text " * 3, size=size, fontsize=50, color="yellow")
+        frame = sprite_to_frame(sprite, position, size)
+        self.assertEqual(frame.shape, (1080, 1920, 4))
+        self.assertEqual(int(frame[:, :, 3].astype(bool).sum()), int(sprite[:, :, 3].astype(bool).sum()))
+
+    def test_empty_text(self):
+        sprite, position = render_subtitle_sprite("", size=(1080, 1920), fontsize=70)
+        self.assertEqual(sprite.shape, (1, 1, 4))
+        self.assertFalse(sprite.any())
+
+class TestFontRegistry(unittest.TestCase):
+    # The font is looked up once per process; start and leave each test with a fresh lookup
+    def setUp(self):
+        resolve_font_path.cache_clear()
+
+    def tearDown(self):
+        resolve_font_path.cache_clear()
+
+    def _truetype(self, loadable):
+        # Stands in for ImageFont.truetype: only the paths in loadable open
+        def truetype(path, size):
+            if path not in loadable:
+                raise IOError(path)
+            return object()
+        return mock.patch.object(subtitles.ImageFont, "truetype", side_effect=truetype)
+
+    def test_env_font_comes_before_candidates(self):
+        with self._truetype({"/fonts/Custom.ttf", "arial.ttf"}), \
+                mock.patch.dict(os.environ, {FONT_ENV_VAR: "/fonts/Custom.ttf"}):
+            self.assertEqual(resolve_font_path(), "/fonts/Custom.ttf")
+            # An explicit font_path still wins
+            self.assertEqual(resolve_font_path("arial.ttf"), "arial.ttf")
+
+    def test_unloadable_env_font_falls_through(self):
+        with self._truetype({"arial.ttf"}), mock.patch.dict(os.environ, {FONT_ENV_VAR: "/missing.ttf"}):
+            self.assertEqual(resolve_font_path(), "arial.ttf")
+        resolve_font_path.cache_clear()
+        with self._truetype(set()), mock.patch("builtins.print"):
+            self.assertIsNone(resolve_font_path())
+
+    def test_repeated_sprite_is_a_cache_hit(self):
+        text = "Sprite cache %d" % id(self)
+        render_subtitle_sprite(text, size=(320, 240), fontsize=20)
+        before = subtitle_cache_info()
+        sprite, _ = render_subtitle_sprite(text, size=(320, 240), fontsize=20)
+        after = subtitle_cache_info()
+        self.assertEqual((after.hits - before.hits, after.misses - before.misses), (1, 0))
+        # Shared between callers, so it must not be modified in place
+        self.assertFalse(sprite.flags.writeable)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import sys
+import os
+import unittest
+from moviepy.editor import ColorClip
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.transitions import TransitionTimeline, transition_window
+
+class TestTransitionTimeline(unittest.TestCase):
+    def setUp(self):
+        self.clips = [ColorClip((8, 8), color=(200, 0, 0), duration=2), ColorClip((8, 8), color=(0, 0, 200), duration=2)]
+
+    def test_crossfade_overlaps_and_blends(self):
+        timeline = TransitionTimeline(self.clips, "crossfade", 0.5, fps=10)
+        self.assertAlmostEqual(timeline.duration, 3.5)
+        # Outside the window frames pass through untouched
+        self.assertTrue((timeline.get_frame(1.0) == self.clips[0].get_frame(1.0)).all())
+        self.assertTrue((timeline.get_frame(2.0) == self.clips[1].get_frame(0.5)).all())
+        # 0.2 s into the 0.5 s window: 60% outgoing, 40% incoming
+        blended = timeline.get_frame(1.7)[0, 0]
+        self.assertLessEqual(abs(int(blended[0]) - 120), 1)
+        self.assertLessEqual(abs(int(blended[2]) - 80), 1)
+
+    def test_dip_to_black_keeps_length(self):
+        timeline = TransitionTimeline(self.clips, "dip_to_black", 0.5, fps=10)
+        self.assertAlmostEqual(timeline.duration, 4.0)
+        self.assertFalse(timeline.get_frame(0.0).any())
+        self.assertLess(int(timeline.get_frame(1.9)[0, 0, 0]), 200)
+        self.assertEqual(int(timeline.get_frame(1.0)[0, 0, 0]), 200)
+
+    def test_cut_and_window_limits(self):
+        timeline = TransitionTimeline(self.clips, "cut", 0.5, fps=10)
+        self.assertEqual(timeline.windows, [])
+        self.assertEqual(transition_window("crossfade", [2, 0.6], 0.5), 0.3)
+        with self.assertRaises(ValueError):
+            transition_window("wipe", [2], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys
+import os
+import copy
+import shutil
+import tempfile
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.render_batch import plan_variations, variant_audio_path
+
+def _scene(scene_id, text):
+    return {"scene_id": scene_id, "dialogue": {"text": text, "voice_gender": "Female"}, "overlays": []}
+
+class TestVariationPlanning(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.work_dir = tempfile.mkdtemp()
+        os.chdir(self.work_dir)
+        for i in (1, 2, 3):
+            with open(f"audio_scene_{i}.mp3", "wb") as f:
+                f.write(f"voice {i}".encode())
+        self.base = {"scenes": [_scene(1, "Hook"), _scene(2, "Middle"), _scene(3, "Ending")]}
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _synthesize(self, synthesized):
+        def synthesize(items):
+            for item in items:
+                synthesized.append(item["output_path"])
+                with open(item["output_path"], "wb") as f:
+                    f.write(item["text"].encode())
+            return [{"success": True} for _ in items]
+        return synthesize
+
+    def test_shared_scenes_render_once(self):
+        a = copy.deepcopy(self.base)
+        a["scenes"][0]["dialogue"]["text"] = "New hook"
+        b = copy.deepcopy(self.base)
+        b["scenes"][2]["dialogue"]["text"] = "New ending"
+        c = copy.deepcopy(self.base)
+        c["scenes"][2]["overlays"] = [{"text": "Buy now", "start_sec": 0, "end_sec": 2, "position": "bottom"}]
+
+        synthesized = []
+        jobs, plans = plan_variations([("A", a), ("B", b), ("C", c)], base_script=self.base,
+                                      synthesize=self._synthesize(synthesized))
+        self.assertEqual(sum(len(keys) for keys in plans.values()), 9)
+        self.assertEqual(len(jobs), 6)  # 3 shared + hook A + ending B + overlay C
+        self.assertEqual(plans["A"][1], plans["B"][1])
+        self.assertEqual(plans["B"][0], plans["C"][0])
+        self.assertEqual(sorted(synthesized), sorted([variant_audio_path(1, "A", "New hook", "Female"),
+                                                      variant_audio_path(3, "B", "New ending", "Female")]))
+
+    def test_edited_variant_dialogue_is_voiced_again(self):
+        a = copy.deepcopy(self.base)
+        a["scenes"][0]["dialogue"]["text"] = "New hook"
+        synthesized = []
+        first, _ = plan_variations([("A", a)], base_script=self.base, synthesize=self._synthesize(synthesized))
+        # Planning the same text again reuses the voice
+        plan_variations([("A", a)], base_script=self.base, synthesize=self._synthesize(synthesized))
+        self.assertEqual(len(synthesized), 1)
+
+        a["scenes"][0]["dialogue"]["text"] = "Another hook"
+        second, plans = plan_variations([("A", a)], base_script=self.base, synthesize=self._synthesize(synthesized))
+        self.assertEqual(len(synthesized), 2)
+        self.assertNotEqual(synthesized[0], synthesized[1])
+        hook = second[plans["A"][0]]
+        self.assertEqual(hook["audio_path"], synthesized[1])
+        self.assertNotIn(plans["A"][0], first)
+
+    def test_picked_voice_style_is_used(self):
+        a = copy.deepcopy(self.base)
+        for scene in a["scenes"][:2]:
+            scene["dialogue"]["text"] += " again"
+        items = []
+        plan_variations([("A", a)], base_script=self.base, synthesize=items.extend,
+                        voice_styles={1: "Female - Soft", 3: "Male - Deep"})
+        # Scene 2 has no pick and keeps its voice_gender's default
+        self.assertEqual([(item["scene_id"], item["voice_style"]) for item in items],
+                         [(1, "Female - Soft"), (2, "Female - Default")])
+        self.assertEqual(items[0]["output_path"], variant_audio_path(1, "A", "Hook again", "Female - Soft"))
+        self.assertNotEqual(items[0]["output_path"], variant_audio_path(1, "A", "Hook again", "Female - Default"))
+
+if __name__ == '__main__':
+    unittest.main()
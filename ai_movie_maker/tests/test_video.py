@@ -0,0 +1,192 @@
+import sys
+import os
+import re
+import shutil
+import tempfile
+import unittest
+import wave
+import numpy as np
+from PIL import Image
+from moviepy.editor import VideoFileClip
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from ai_movie_maker.services.media_io import probe_media, run_ffmpeg
+from ai_movie_maker.services.speech_timing import voice_duration
+from ai_movie_maker.services.video import (
+    DEFAULT_RENDER_PROFILE, RENDER_PROFILES, assemble_full_movie, compose_still_frame, get_render_profile,
+    render_movie_direct, render_scene_video, scale_resolution
+)
+
+def _write_voice(path, seconds, sample_rate=44100):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    samples = (8000 * np.sin(2 * np.pi * 220 * t)).astype("<i2")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(samples.tobytes())
+
+def _stream_duration(path, stream):
+    # Timestamp of the last packet of one stream ("v" or "a"), from ffmpeg's progress line
+    infos = run_ffmpeg(["-i", path, "-map", f"0:{stream}:0", "-c", "copy", "-f", "null", "-"])
+    h, m, s = re.findall(r"time=(\d+):(\d+):(\d+(?:\.\d+)?)", infos)[-1]
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+class TestRenderProfiles(unittest.TestCase):
+    def test_scale_resolution_keeps_even_sides(self):
+        self.assertEqual(scale_resolution((1080, 1920), 0.5), (540, 960))
+        self.assertEqual(scale_resolution((1080, 1920), 1.0), (1080, 1920))
+        # 1080 * 0.3 = 324 and 1920 * 0.3 = 576; 101 * 0.5 = 50.5 rounds to an even 50
+        self.assertEqual(scale_resolution((1080, 1920), 0.3), (324, 576))
+        self.assertEqual(scale_resolution((101, 99), 0.5), (50, 50))
+
+    def test_unknown_profile_falls_back_to_default(self):
+        self.assertIs(get_render_profile("draft"), RENDER_PROFILES["draft"])
+        self.assertIs(get_render_profile("cinema"), RENDER_PROFILES[DEFAULT_RENDER_PROFILE])
+        self.assertIs(get_render_profile(None), RENDER_PROFILES[DEFAULT_RENDER_PROFILE])
+
+class TestStillFastPath(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.image = os.path.join(self.work_dir, "img.png")
+        Image.new("RGB", (640, 240), (200, 40, 40)).save(self.image)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_frame_is_fitted_image_with_subtitle(self):
+        frame = compose_still_frame(self.image, "Xin chào", resolution=(320, 240), fontsize=30)
+        self.assertEqual((frame.shape, frame.dtype), ((240, 320, 3), np.uint8))
+        self.assertEqual(tuple(frame[5, 5]), (200, 40, 40))
+        # The subtitle is drawn in white somewhere in the frame
+        self.assertTrue((frame.min(axis=2) > 200).any())
+        self.assertFalse(compose_still_frame(None, "", resolution=(320, 240)).any())
+
+    def test_still_scene_matches_scene_stream_parameters(self):
+        voice = os.path.join(self.work_dir, "voice.wav")
+        _write_voice(voice, 1.0, sample_rate=22050)
+        output = os.path.join(self.work_dir, "scene.mp4")
+        stats = {}
+        success, msg = render_scene_video(self.image, voice, "Xin chào", output, resolution=(320, 240), profile="draft",
+                                          normalize_media=False, stats=stats)
+        self.assertTrue(success, msg)
+        self.assertEqual(stats["path"], "still")
+        params = probe_media(output)
+        self.assertEqual({k: params[k] for k in ("video_codec", "width", "height", "fps", "pix_fmt", "audio_codec",
+                                                 "sample_rate", "channels")},
+                         {"video_codec": "h264", "width": 160, "height": 120, "fps": 12, "pix_fmt": "yuv420p",
+                          "audio_codec": "aac", "sample_rate": 44100, "channels": "stereo"})
+        self.assertAlmostEqual(params["duration"], 1.0, delta=0.1)
+
+class TestStreamCopyAssembly(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.work_dir = tempfile.mkdtemp()
+        cls.scenes = []
+        for i, color in enumerate([(200, 40, 40), (40, 200, 40), (40, 40, 200)]):
+            image = os.path.join(cls.work_dir, f"img{i}.png")
+            Image.new("RGB", (320, 240), color).save(image)
+            voice = os.path.join(cls.work_dir, f"voice{i}.wav")
+            _write_voice(voice, 2.0)
+            output = os.path.join(cls.work_dir, f"scene{i}.mp4")
+            success, msg = render_scene_video(image, voice, f"Cảnh {i + 1}", output, resolution=(320, 240),
+                                              profile="draft", normalize_media=False)
+            assert success, msg
+            cls.scenes.append(output)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.work_dir, ignore_errors=True)
+
+    def _assemble(self, transition):
+        output = os.path.join(self.work_dir, f"movie_{transition}.mp4")
+        stats = {}
+        success, msg = assemble_full_movie(self.scenes, output, transition=transition, transition_duration=0.5,
+                                           mode="copy", profile="draft", stats=stats)
+        self.assertTrue(success, msg)
+        self.assertEqual(stats["path"], "copy")
+        # Audio and video end together
+        self.assertAlmostEqual(_stream_duration(output, "v"), _stream_duration(output, "a"), delta=0.1)
+        return probe_media(output)["duration"]
+
+    def test_cut_and_dip_keep_total_length(self):
+        self.assertAlmostEqual(self._assemble("cut"), 6.0, delta=0.15)
+        self.assertAlmostEqual(self._assemble("dip_to_black"), 6.0, delta=0.15)
+
+    def test_crossfade_overlaps_scenes(self):
+        self.assertAlmostEqual(self._assemble("crossfade"), 6.0 - 2 * 0.5, delta=0.15)
+
+    def test_copy_mode_rejects_mismatched_scenes(self):
+        image = os.path.join(self.work_dir, "wide.png")
+        Image.new("RGB", (640, 240), (90, 90, 90)).save(image)
+        other = os.path.join(self.work_dir, "wide.mp4")
+        success, msg = render_scene_video(image, os.path.join(self.work_dir, "voice0.wav"), "Khác", other,
+                                          resolution=(640, 240), profile="draft", normalize_media=False)
+        self.assertTrue(success, msg)
+        success, msg = assemble_full_movie([self.scenes[0], other], os.path.join(self.work_dir, "mixed.mp4"),
+                                           mode="copy", profile="draft")
+        self.assertFalse(success)
+        self.assertIn("width", msg)
+
+    def test_auto_mode_fits_mismatched_scenes(self):
+        for name, size, color, transition, expected in [("wide", (640, 240), (90, 90, 90), "cut", 4.0),
+                                                        ("tall", (240, 320), (230, 200, 0), "crossfade", 3.5)]:
+            image = os.path.join(self.work_dir, f"{name}_auto.png")
+            Image.new("RGB", size, color).save(image)
+            scene = os.path.join(self.work_dir, f"{name}_auto.mp4")
+            success, msg = render_scene_video(image, os.path.join(self.work_dir, "voice1.wav"), "Khác", scene,
+                                              resolution=size, profile="draft", normalize_media=False)
+            self.assertTrue(success, msg)
+            output = os.path.join(self.work_dir, f"movie_auto_{name}.mp4")
+            stats = {}
+            success, msg = assemble_full_movie([self.scenes[0], scene], output, transition=transition,
+                                               transition_duration=0.5, mode="auto", profile="draft", stats=stats)
+            self.assertTrue(success, msg)
+            self.assertEqual(stats["path"], "reencode")
+            # The second scene is fitted to the first scene's frame
+            params = probe_media(output)
+            self.assertEqual((params["width"], params["height"]), (160, 120))
+            self.assertAlmostEqual(params["duration"], expected, delta=0.15)
+            clip = VideoFileClip(output, audio=False)
+            try:
+                self.assertLess(np.abs(clip.get_frame(expected - 0.5)[4, 4].astype(int) - color).max(), 12)
+            finally:
+                clip.close()
+
+class TestDirectRender(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_still_and_black_scenes(self):
+        image = os.path.join(self.work_dir, "img.png")
+        Image.new("RGB", (320, 240), (200, 40, 40)).save(image)
+        scenes = []
+        for i, (image_path, seconds) in enumerate([(image, 1.5), (None, 1.0)]):
+            voice = os.path.join(self.work_dir, f"voice{i}.wav")
+            _write_voice(voice, seconds)
+            scenes.append({"image_path": image_path, "audio_path": voice, "subtitle_text": f"Cảnh {i + 1}"})
+        output = os.path.join(self.work_dir, "movie.mp4")
+        success, msg = render_movie_direct(scenes, output, resolution=(320, 240), profile="draft", transition="cut",
+                                           normalize_media=False)
+        self.assertTrue(success, msg)
+        expected = sum(voice_duration(scene["audio_path"]) for scene in scenes)
+        params = probe_media(output)
+        self.assertAlmostEqual(params["duration"], expected, delta=0.15)
+        self.assertEqual((params["width"], params["height"]), (160, 120))
+        clip = VideoFileClip(output, audio=False)
+        try:
+            self.assertGreater(int(clip.get_frame(0.5)[2, 2, 0]), 150)
+            self.assertLess(int(clip.get_frame(2.0)[2, 2].max()), 20)
+        finally:
+            clip.close()
+
+    def test_no_scenes(self):
+        self.assertEqual(render_movie_direct([], os.path.join(self.work_dir, "movie.mp4")), (False, "No scenes to render"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from moviepy.editor import AudioFileClip
+from ai_movie_maker.services.video import render_scene_video, _build_composited_clip
+from ai_movie_maker.services.clip_buffer import load_clip_buffer
+from ai_movie_maker.services.media_io import run_ffmpeg
+from ai_movie_maker.services.pipe_renderer import SpriteLayer, frame_count
+from ai_movie_maker.services.subtitles import render_subtitle_sprite
+
+SUBTITLE = "This is a benchmark subtitle"
+
+def _per_frame_allocations(make_frame, n_frames, fps):
+    """
+    Composites n_frames without encoding. Returns (frames per second, mean bytes allocated
+    and still alive at the per-frame peak), measured with tracemalloc.
+    """
+    make_frame(0.0)  # warm up lazy state (fonts, sprite cache)
+    tracemalloc.start()
+    transient = 0
+    start = time.time()
+    for i in range(n_frames):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        make_frame(i / fps)
+        _, peak = tracemalloc.get_traced_memory()
+        transient += peak - current
+    elapsed = time.time() - start
+    tracemalloc.stop()
+    return n_frames / elapsed, transient / n_frames
+
+def bench_compositing(clip_path, audio_path, resolution=(1080, 1920), fps=24):
+    audio = AudioFileClip(audio_path)
+    duration = audio.duration
+    n_frames = frame_count(duration, fps)
+
+    clip, _ = _build_composited_clip(audio, duration, None, SUBTITLE, resolution, 70, "white", clip_path)
+    moviepy_frame = lambda t: clip.get_frame(t).astype("uint8")
+
+    clip_buffer = load_clip_buffer(clip_path, resolution)
+    sprite, position = render_subtitle_sprite(SUBTITLE, size=resolution, fontsize=70, color="white")
+    layer = SpriteLayer(sprite, position, resolution)
+    frame = np.empty((resolution[1], resolution[0], 3), dtype=np.uint8)
+    def pipe_frame(t):
+        np.copyto(frame, clip_buffer.get_frame(t))
+        layer.blit(frame)
+
+    for name, make_frame in (("moviepy", moviepy_frame), ("pipe", pipe_frame)):
+        rate, allocated = _per_frame_allocations(make_frame, n_frames, fps)
+        print(f"{name:>8} compositing: {rate:7.1f} fps, {allocated / 1024 ** 2:6.2f} MB allocated per frame")
+    audio.close()
+
+def bench_end_to_end(clip_path, audio_path, resolution=(1080, 1920)):
+    outputs = {}
+    for backend in ("moviepy", "pipe"):
+        out = f"bench_pipe_{backend}.mp4"
+        start = time.time()
+        success, msg = render_scene_video(None, audio_path, SUBTITLE, out, resolution=resolution,
+                                          video_clip_path=clip_path, backend=backend)
+        elapsed = time.time() - start
+        if not success:
+            print(f"{backend}: failed ({msg})")
+            return
+        outputs[backend] = out
+        n_frames = frame_count(AudioFileClip(audio_path).duration, 24)
+        print(f"{backend:>8} render: {elapsed:6.2f}s ({n_frames / elapsed:.1f} fps incl. encode)")
+
+    infos = run_ffmpeg(["-i", outputs["moviepy"], "-i", outputs["pipe"], "-lavfi", "psnr", "-f", "null", "-"])
+    m = re.search(r"PSNR.*average:(\S+)", infos)
+    print(f"PSNR pipe vs moviepy: {m.group(1) if m else '?'} dB")
+
+    for out in outputs.values():
+        os.remove(out)
+
+if __name__ == "__main__":
+    clip = sys.argv[1] if len(sys.argv) > 1 else "video_scene_1_raw.mp4"
+    audio = sys.argv[2] if len(sys.argv) > 2 else "audio_scene_1.mp3"
+    bench_compositing(clip, audio)
+    bench_end_to_end(clip, audio)
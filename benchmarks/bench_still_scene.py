@@ -0,0 +1,38 @@
+import os
+import re
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai_movie_maker.services.video import render_scene_video
+from ai_movie_maker.services.media_io import run_ffmpeg
+
+def bench_still_scene(img_path="img_scene_1.png", audio_path="audio_scene_1.mp3", resolution=(1080, 1920)):
+    """
+    Renders the same image+subtitle scene through the MoviePy composite path and the
+    pre-composited still path, then reports timings and the PSNR between the two outputs.
+    """
+    outputs = {}
+    for name, fast in (("composite", False), ("still", True)):
+        out = f"bench_still_{name}.mp4"
+        start = time.time()
+        success, msg = render_scene_video(img_path, audio_path, "This is a benchmark subtitle", out,
+                                          resolution=resolution, still_fast_path=fast)
+        elapsed = time.time() - start
+        if not success:
+            print(f"{name}: failed ({msg})")
+            return
+        outputs[name] = out
+        print(f"{name:>10}: {elapsed:.2f}s")
+
+    infos = run_ffmpeg(["-i", outputs["composite"], "-i", outputs["still"], "-lavfi", "psnr", "-f", "null", "-"])
+    m = re.search(r"PSNR.*average:(\S+)", infos)
+    print(f"PSNR still vs composite: {m.group(1) if m else '?'} dB")
+
+    for out in outputs.values():
+        os.remove(out)
+
+if __name__ == "__main__":
+    bench_still_scene(*sys.argv[1:3])